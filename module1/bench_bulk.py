@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Ingestion benchmark: one POST per document vs parallel _bulk batches
+Runs against the local stand-in server so no Elasticsearch is needed
+"""
+
+import argparse
+import json
+import time
+
+import requests
+
+from bulk_indexer import BulkIndexer
+from fake_es import start_server
+
+
+INDEX_NAME = "course-questions"
+
+
+def make_documents(n):
+    """Generate FAQ-shaped synthetic documents"""
+    courses = ["data-engineering-zoomcamp", "machine-learning-zoomcamp", "mlops-zoomcamp"]
+    return [
+        {
+            "course": courses[i % len(courses)],
+            "section": f"Section {i % 10}",
+            "question": f"Question number {i}: how do I run the homework?",
+            "text": "Answer text with a few sentences of explanation. " * 5,
+        }
+        for i in range(n)
+    ]
+
+
+def reset_index(es_url):
+    requests.delete(f"{es_url}/{INDEX_NAME}")
+    requests.put(f"{es_url}/{INDEX_NAME}",
+                 headers={"Content-Type": "application/json"},
+                 data=json.dumps({"mappings": {"properties": {"course": {"type": "keyword"}}}}))
+
+
+def index_one_by_one(es_url, documents):
+    for doc in documents:
+        requests.post(f"{es_url}/{INDEX_NAME}/_doc",
+                      headers={"Content-Type": "application/json"},
+                      data=json.dumps(doc))
+
+
+def index_bulk(es_url, documents, batch_size, workers):
+    indexer = BulkIndexer(es_url, INDEX_NAME, batch_size=batch_size, workers=workers)
+    stats = indexer.index_documents(documents)
+    if stats["errors"]:
+        print(f"  {len(stats['errors'])} documents failed")
+
+
+def timed(label, func, n):
+    start = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<30} {elapsed:8.3f}s  {n / elapsed:10.0f} docs/sec")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--docs", type=int, default=2000)
+    parser.add_argument("--latency", type=float, default=0.002,
+                        help="Simulated round-trip latency per request in seconds")
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--es-url", default=None,
+                        help="Benchmark a real cluster instead of the stand-in server")
+    args = parser.parse_args()
+
+    server = None
+    es_url = args.es_url
+    if es_url is None:
+        server, es_url = start_server(latency=args.latency)
+
+    documents = make_documents(args.docs)
+    print(f"Indexing {len(documents)} documents into {es_url}")
+
+    reset_index(es_url)
+    timed("one request per document", lambda: index_one_by_one(es_url, documents), len(documents))
+
+    reset_index(es_url)
+    timed(f"_bulk x1 (batch={args.batch_size})",
+          lambda: index_bulk(es_url, documents, args.batch_size, 1), len(documents))
+
+    reset_index(es_url)
+    timed(f"_bulk x{args.workers} (batch={args.batch_size})",
+          lambda: index_bulk(es_url, documents, args.batch_size, args.workers), len(documents))
+
+    if server is not None:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Prompt building benchmark: format-then-count vs the token-budgeted builder
+Builds one prompt per FAQ question from a sliding window of 3 documents
+"""
+
+import argparse
+import json
+import time
+
+import requests
+import tiktoken
+
+from prompt_builder import CONTEXT_TEMPLATE, PROMPT_TEMPLATE, PromptBuilder, doc_key
+
+
+DOCS_URL = 'https://github.com/DataTalksClub/llm-zoomcamp/blob/main/01-intro/documents.json?raw=1'
+
+
+def load_documents(path=None):
+    if path is None:
+        documents_raw = requests.get(DOCS_URL).json()
+    else:
+        with open(path) as f:
+            documents_raw = json.load(f)
+
+    documents = []
+    for course in documents_raw:
+        for doc in course['documents']:
+            doc['course'] = course['course']
+            documents.append(doc)
+    return documents
+
+
+def make_workload(documents, hits_per_prompt=3):
+    """(question, hits) pairs: each document's question with the next few docs as context"""
+    n = len(documents)
+    return [
+        (doc['question'], [documents[(i + j) % n] for j in range(hits_per_prompt)])
+        for i, doc in enumerate(documents)
+    ]
+
+
+def build_then_count(workload, model_name):
+    """The script.py approach: format the prompt, then count its tokens"""
+    encoding = tiktoken.encoding_for_model(model_name)
+    total_tokens = 0
+    counts = []
+    for question, hits in workload:
+        context = "\n\n".join(
+            CONTEXT_TEMPLATE.format(question=d['question'], text=d['text']) for d in hits
+        )
+        prompt = PROMPT_TEMPLATE.format(question=question, context=context)
+        count = len(encoding.encode(prompt))
+        counts.append(count)
+        total_tokens += count
+    return total_tokens, counts
+
+
+def budgeted(workload, model_name, max_tokens):
+    builder = PromptBuilder(model_name)
+    total_tokens = 0
+    counts = []
+    for question, hits in workload:
+        built = builder.build(question, hits, max_tokens=max_tokens)
+        counts.append(built.token_count)
+        total_tokens += built.token_count
+    return total_tokens, counts
+
+
+def timed(label, func, n_prompts):
+    start = time.perf_counter()
+    total_tokens, counts = func()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<28} {elapsed:8.3f}s  {n_prompts / elapsed:10.0f} prompts/sec"
+          f"  {total_tokens / elapsed:12.0f} tokens/sec")
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--docs-file", default=None,
+                        help="Local documents.json instead of downloading it")
+    parser.add_argument("--model", default="gpt-4o")
+    parser.add_argument("--max-tokens", type=int, default=None)
+    args = parser.parse_args()
+
+    documents = load_documents(args.docs_file)
+    for doc in documents:
+        doc['id'] = doc_key(doc)
+    workload = make_workload(documents)
+    print(f"Building {len(workload)} prompts from {len(documents)} documents")
+
+    baseline_counts = timed("build then count", lambda: build_then_count(workload, args.model),
+                            len(workload))
+    builder_counts = timed("prompt builder", lambda: budgeted(workload, args.model, args.max_tokens),
+                           len(workload))
+
+    if args.max_tokens is None:
+        mismatches = sum(a != b for a, b in zip(baseline_counts, builder_counts))
+        max_diff = max(abs(a - b) for a, b in zip(baseline_counts, builder_counts))
+        print(f"Token counts differing from a full re-encode: {mismatches} (max diff {max_diff})")
+    else:
+        # Recount outside the timed run: the builder only encodes prompts near the budget
+        builder = PromptBuilder(args.model)
+        encoding = tiktoken.encoding_for_model(args.model)
+        over = sum(
+            len(encoding.encode(builder.build(question, hits, args.max_tokens).prompt)) > args.max_tokens
+            for question, hits in workload
+        )
+        print(f"Prompts over the {args.max_tokens} token budget: {over}")
+
+
+if __name__ == "__main__":
+    main()
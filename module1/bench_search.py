@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Search benchmark: one requests.post per query vs pooled _msearch batches
+Runs against the local stand-in server so no Elasticsearch is needed
+"""
+
+import argparse
+import json
+import time
+
+import requests
+
+from bench_bulk import INDEX_NAME, index_bulk, make_documents, reset_index
+from fake_es import start_server
+from search_client import SearchClient, build_query
+
+
+def make_queries(documents, n):
+    return [
+        build_query(documents[i % len(documents)]["question"], size=5,
+                    course=documents[i % len(documents)]["course"])
+        for i in range(n)
+    ]
+
+
+def search_one_by_one(es_url, queries):
+    for query in queries:
+        response = requests.post(f"{es_url}/{INDEX_NAME}/_search",
+                                 headers={"Content-Type": "application/json"},
+                                 data=json.dumps(query))
+        response.json()
+
+
+def timed(label, func, n):
+    start = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<30} {elapsed:8.3f}s  {n / elapsed:10.0f} queries/sec")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--docs", type=int, default=200)
+    parser.add_argument("--queries", type=int, default=1000)
+    parser.add_argument("--latency", type=float, default=0.002,
+                        help="Simulated round-trip latency per request in seconds")
+    parser.add_argument("--batch-size", type=int, default=100)
+    parser.add_argument("--es-url", default=None,
+                        help="Benchmark a real cluster instead of the stand-in server")
+    args = parser.parse_args()
+
+    server = None
+    es_url = args.es_url
+    if es_url is None:
+        server, es_url = start_server(latency=args.latency)
+
+    documents = make_documents(args.docs)
+    reset_index(es_url)
+    index_bulk(es_url, documents, batch_size=500, workers=1)
+
+    queries = make_queries(documents, args.queries)
+    print(f"Running {len(queries)} queries against {es_url}")
+
+    timed("one request per query", lambda: search_one_by_one(es_url, queries), len(queries))
+
+    client = SearchClient(es_url, INDEX_NAME, batch_size=args.batch_size)
+    timed(f"_msearch (batch={args.batch_size})", lambda: client.msearch(queries), len(queries))
+    client.close()
+
+    if server is not None:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
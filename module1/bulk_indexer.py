@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Bulk indexing for Elasticsearch
+Sends documents as NDJSON _bulk batches over a shared keep-alive session
+"""
+
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from requests.adapters import HTTPAdapter
+
+
+def make_session(pool_size=10):
+    """Create a keep-alive session with a connection pool of the given size"""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def chunked(items, size):
+    """Yield consecutive lists of at most size items"""
+    batch = []
+    for item in items:
+        batch.append(item)
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def to_ndjson(index_name, docs):
+    """Encode documents as a _bulk NDJSON body (action line + source line)"""
+    lines = []
+    for doc in docs:
+        action = {"index": {"_index": index_name}}
+        if "_id" in doc:
+            action["index"]["_id"] = doc["_id"]
+            doc = {k: v for k, v in doc.items() if k != "_id"}
+        lines.append(json.dumps(action))
+        lines.append(json.dumps(doc))
+    return "\n".join(lines) + "\n"
+
+
+class BulkIndexer:
+    def __init__(self, es_url, index_name, batch_size=500, workers=4, session=None):
+        self.es_url = es_url.rstrip("/")
+        self.index_name = index_name
+        self.batch_size = batch_size
+        self.workers = workers
+        self.session = session or make_session(pool_size=workers)
+
+    def get_refresh_interval(self):
+        """Return the current refresh interval of the index (None if default)"""
+        response = self.session.get(f"{self.es_url}/{self.index_name}/_settings")
+        response.raise_for_status()
+        settings = response.json().get(self.index_name, {}).get("settings", {})
+        return settings.get("index", {}).get("refresh_interval")
+
+    def set_refresh_interval(self, value):
+        """Set the refresh interval of the index ("-1" disables refresh)"""
+        response = self.session.put(
+            f"{self.es_url}/{self.index_name}/_settings",
+            headers={"Content-Type": "application/json"},
+            data=json.dumps({"index": {"refresh_interval": value}}),
+        )
+        response.raise_for_status()
+
+    def refresh(self):
+        """Make all indexed documents visible to search"""
+        response = self.session.post(f"{self.es_url}/{self.index_name}/_refresh")
+        response.raise_for_status()
+
+    def send_batch(self, docs):
+        """
+        Send one _bulk request
+
+        Returns:
+            tuple: (number of indexed documents, list of per-item errors)
+        """
+        response = self.session.post(
+            f"{self.es_url}/_bulk",
+            headers={"Content-Type": "application/x-ndjson"},
+            data=to_ndjson(self.index_name, docs).encode("utf-8"),
+        )
+        if response.status_code >= 400:
+            error = {"status": response.status_code, "error": response.text}
+            return 0, [dict(error, doc=doc) for doc in docs]
+
+        body = response.json()
+        if not body.get("errors"):
+            return len(docs), []
+
+        indexed = 0
+        errors = []
+        for doc, item in zip(docs, body["items"]):
+            result = item.get("index", {})
+            if "error" in result:
+                errors.append({
+                    "status": result.get("status"),
+                    "error": result["error"],
+                    "doc": doc,
+                })
+            else:
+                indexed += 1
+        return indexed, errors
+
+    def index_documents(self, documents, progress=None):
+        """
+        Index all documents in parallel _bulk batches
+
+        Refresh is turned off while loading and restored afterwards.
+
+        Args:
+            documents: Iterable of document dictionaries
+            progress: Optional callback called with the running indexed count
+
+        Returns:
+            dict: Number of indexed documents, batches sent and per-item errors
+        """
+        previous_interval = self.get_refresh_interval()
+        self.set_refresh_interval("-1")
+
+        indexed = 0
+        batches = 0
+        errors = []
+        try:
+            with ThreadPoolExecutor(max_workers=self.workers) as executor:
+                batch_results = executor.map(
+                    self.send_batch, chunked(documents, self.batch_size)
+                )
+                for batch_indexed, batch_errors in batch_results:
+                    indexed += batch_indexed
+                    batches += 1
+                    errors.extend(batch_errors)
+                    if progress is not None:
+                        progress(indexed)
+        finally:
+            # None restores the cluster default
+            self.set_refresh_interval(previous_interval)
+            self.refresh()
+
+        return {"indexed": indexed, "batches": batches, "errors": errors}
@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for the Elasticsearch HTTP API
+Implements just enough of the index, _doc, _bulk, _settings, _search and
+_msearch endpoints to benchmark ingestion and search offline
+"""
+
+import argparse
+import json
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+def tokenize(text):
+    return re.findall(r"\w+", text.lower())
+
+
+class FakeElasticsearch:
+    def __init__(self, latency=0.0):
+        self.latency = latency
+        self.indices = {}
+        self.lock = threading.Lock()
+
+    def create_index(self, name, body):
+        with self.lock:
+            if name in self.indices:
+                return 400, {"error": {"type": "resource_already_exists_exception"}}
+            self.indices[name] = {"settings": {}, "mappings": body.get("mappings", {}), "docs": {}}
+        return 200, {"acknowledged": True, "index": name}
+
+    def delete_index(self, name):
+        with self.lock:
+            if self.indices.pop(name, None) is None:
+                return 404, {"error": {"type": "index_not_found_exception"}}
+        return 200, {"acknowledged": True}
+
+    def add_doc(self, name, doc, doc_id=None):
+        with self.lock:
+            index = self.indices.get(name)
+            if index is None:
+                return 404, {"error": {"type": "index_not_found_exception", "index": name}}
+            if doc_id is None:
+                doc_id = str(len(index["docs"]) + 1)
+            index["docs"][doc_id] = doc
+        return 201, {"_index": name, "_id": doc_id, "result": "created"}
+
+    def bulk(self, default_index, body):
+        lines = [line for line in body.split("\n") if line.strip()]
+        items = []
+        errors = False
+        for action_line, source_line in zip(lines[::2], lines[1::2]):
+            action = json.loads(action_line)["index"]
+            name = action.get("_index", default_index)
+            try:
+                doc = json.loads(source_line)
+            except ValueError as e:
+                status, result = 400, {"error": {"type": "mapper_parsing_exception", "reason": str(e)}}
+            else:
+                status, result = self.add_doc(name, doc, action.get("_id"))
+            result["status"] = status
+            errors = errors or "error" in result
+            items.append({"index": result})
+        return 200, {"took": 0, "errors": errors, "items": items}
+
+    def get_settings(self, name):
+        index = self.indices.get(name)
+        if index is None:
+            return 404, {"error": {"type": "index_not_found_exception"}}
+        return 200, {name: {"settings": {"index": dict(index["settings"])}}}
+
+    def put_settings(self, name, body):
+        index = self.indices.get(name)
+        if index is None:
+            return 404, {"error": {"type": "index_not_found_exception"}}
+        for key, value in body.get("index", {}).items():
+            if value is None:
+                index["settings"].pop(key, None)
+            else:
+                index["settings"][key] = value
+        return 200, {"acknowledged": True}
+
+    def search(self, name, body):
+        """Score documents by boosted token overlap (a crude multi_match)"""
+        index = self.indices.get(name)
+        if index is None:
+            return 404, {"error": {"type": "index_not_found_exception", "index": name}}
+
+        query = body.get("query", {})
+        term_filter = {}
+        if "bool" in query:
+            term_filter = query["bool"].get("filter", {}).get("term", {})
+            query = query["bool"].get("must", {})
+        multi_match = query.get("multi_match", {})
+        tokens = set(tokenize(multi_match.get("query", "")))
+
+        fields = []
+        for field in multi_match.get("fields", []):
+            field_name, _, boost = field.partition("^")
+            fields.append((field_name, float(boost or 1)))
+
+        hits = []
+        for doc_id, doc in list(index["docs"].items()):
+            if any(doc.get(k) != v for k, v in term_filter.items()):
+                continue
+            score = 0.0
+            for field_name, boost in fields:
+                field_tokens = tokenize(str(doc.get(field_name, "")))
+                score = max(score, boost * sum(t in tokens for t in field_tokens))
+            if score > 0:
+                hits.append({"_index": name, "_id": doc_id, "_score": score, "_source": doc})
+
+        hits.sort(key=lambda h: h["_score"], reverse=True)
+        hits = hits[:body.get("size", 10)]
+        return 200, {"took": 0, "hits": {"total": {"value": len(hits)}, "hits": hits}}
+
+    def msearch(self, default_index, body):
+        lines = [line for line in body.split("\n") if line.strip()]
+        responses = []
+        for header_line, query_line in zip(lines[::2], lines[1::2]):
+            name = json.loads(header_line).get("index", default_index)
+            status, result = self.search(name, json.loads(query_line))
+            result["status"] = status
+            responses.append(result)
+        return 200, {"took": 0, "responses": responses}
+
+    def handle(self, method, path, body):
+        """Route a request and return (status, response dict)"""
+        if self.latency:
+            time.sleep(self.latency)
+
+        parts = [p for p in path.split("?")[0].split("/") if p]
+        if not parts:
+            return 200, {"name": "fake-es", "version": {"number": "8.17.6"}}
+
+        if parts[0] == "_bulk":
+            return self.bulk(None, body)
+        if parts[0] == "_msearch":
+            return self.msearch(None, body)
+
+        name = parts[0]
+        endpoint = parts[1] if len(parts) > 1 else None
+        data = json.loads(body) if body and endpoint not in ("_bulk", "_msearch") else {}
+
+        if endpoint is None:
+            if method == "PUT":
+                return self.create_index(name, data)
+            if method == "DELETE":
+                return self.delete_index(name)
+        elif endpoint == "_doc" and method in ("POST", "PUT"):
+            return self.add_doc(name, data, parts[2] if len(parts) > 2 else None)
+        elif endpoint == "_bulk":
+            return self.bulk(name, body)
+        elif endpoint == "_settings":
+            if method == "GET":
+                return self.get_settings(name)
+            return self.put_settings(name, data)
+        elif endpoint == "_search":
+            return self.search(name, data)
+        elif endpoint == "_msearch":
+            return self.msearch(name, body)
+        elif endpoint == "_refresh":
+            return 200, {"_shards": {"failed": 0}}
+
+        return 400, {"error": {"type": "unsupported_operation", "reason": f"{method} {path}"}}
+
+
+def make_handler(es):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def _dispatch(self):
+            length = int(self.headers.get("Content-Length") or 0)
+            body = self.rfile.read(length).decode("utf-8") if length else ""
+            status, response = es.handle(self.command, self.path, body)
+            payload = json.dumps(response).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        do_GET = do_PUT = do_POST = do_DELETE = _dispatch
+
+        def log_message(self, format, *args):
+            pass
+
+    return Handler
+
+
+def start_server(host="127.0.0.1", port=0, latency=0.0):
+    """
+    Start the stand-in server in a background thread
+
+    Returns:
+        tuple: (server, base URL)
+    """
+    es = FakeElasticsearch(latency=latency)
+    server = ThreadingHTTPServer((host, port), make_handler(es))
+    server.daemon_threads = True
+    server.es = es
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server, f"http://{host}:{server.server_address[1]}"
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run a local Elasticsearch stand-in")
+    parser.add_argument("--port", type=int, default=9200)
+    parser.add_argument("--latency", type=float, default=0.0,
+                        help="Artificial per-request latency in seconds")
+    args = parser.parse_args()
+
+    server, url = start_server(port=args.port, latency=args.latency)
+    print(f"Fake Elasticsearch listening on {url}")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Token-budgeted RAG prompt builder
+Encodes each context entry once and packs search hits into a token budget
+"""
+
+import hashlib
+from collections import namedtuple
+from functools import lru_cache
+
+import tiktoken
+
+
+CONTEXT_TEMPLATE = """
+Q: {question}
+A: {text}
+""".strip()
+
+PROMPT_TEMPLATE = """
+You're a course teaching assistant. Answer the QUESTION based on the CONTEXT from the FAQ database.
+Use only the facts from the CONTEXT when answering the QUESTION.
+
+QUESTION: {question}
+
+CONTEXT:
+{context}
+""".strip()
+
+
+BuiltPrompt = namedtuple("BuiltPrompt", ["prompt", "token_count", "doc_ids"])
+
+
+@lru_cache(maxsize=None)
+def get_encoding(model_name="gpt-4o"):
+    """Load the tiktoken encoding for a model once per process"""
+    return tiktoken.encoding_for_model(model_name)
+
+
+def doc_key(doc):
+    """Stable memo key for a document without an id"""
+    text = doc.get("question", "") + "\x00" + doc.get("text", "")
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+
+class PromptBuilder:
+    def __init__(self, model_name="gpt-4o", context_template=CONTEXT_TEMPLATE,
+                 prompt_template=PROMPT_TEMPLATE, separator="\n\n", budget_margin=8):
+        self.encoding = get_encoding(model_name)
+        self.budget_margin = budget_margin
+        self.context_template = context_template
+        self.prompt_template = prompt_template
+        self.separator = separator
+        self.separator_tokens = len(self.encoding.encode(separator))
+        self.entries = {}
+
+        # Template text around {context} is encoded per question, the rest once
+        self.prefix_template, _, self.suffix = prompt_template.partition("{context}")
+        self.suffix_tokens = len(self.encoding.encode(self.suffix))
+
+    def entry(self, doc_id, doc):
+        """Return (context entry text, token count), encoding each doc only once"""
+        cached = self.entries.get(doc_id)
+        if cached is None:
+            text = self.context_template.format(question=doc["question"], text=doc["text"])
+            cached = (text, len(self.encoding.encode(text)))
+            self.entries[doc_id] = cached
+        return cached
+
+    def build(self, question, hits, max_tokens=None):
+        """
+        Build a prompt from search hits without exceeding a token budget
+
+        Hits are taken greedily in rank order; an entry that does not fit is
+        skipped and smaller entries further down may still be packed.
+        Packing uses the sum of per-part token counts, which can differ from
+        the count of the joined text by a few tokens at part boundaries. Only
+        when that sum is within budget_margin of max_tokens is the prompt
+        encoded once; if it is over, trailing entries are dropped to cover
+        the measured difference.
+
+        Args:
+            question: User question
+            hits: Search hits with .id and .source (see search_client.Hit),
+                or plain document dictionaries
+            max_tokens: Token budget for the whole prompt, or None for no limit
+
+        Returns:
+            BuiltPrompt: Prompt text, its token count (the per-part sum,
+                corrected by the measured difference when it was encoded)
+                and the packed doc ids
+        """
+        prefix = self.prefix_template.format(question=question)
+        token_count = len(self.encoding.encode(prefix)) + self.suffix_tokens
+
+        context_entries = []
+        doc_ids = []
+        costs = []
+        for hit in hits:
+            if isinstance(hit, dict):
+                doc_id, doc = hit.get("id") or doc_key(hit), hit
+            else:
+                doc_id, doc = (hit.id or doc_key(hit.source)), hit.source
+
+            text, entry_tokens = self.entry(doc_id, doc)
+            cost = entry_tokens + (self.separator_tokens if context_entries else 0)
+            if max_tokens is not None and token_count + cost > max_tokens:
+                continue
+
+            context_entries.append(text)
+            doc_ids.append(doc_id)
+            costs.append(cost)
+            token_count += cost
+
+        prompt = prefix + self.separator.join(context_entries) + self.suffix
+        if max_tokens is not None and token_count > max_tokens - self.budget_margin:
+            # Close to the budget: measure the boundary difference once
+            difference = len(self.encoding.encode(prompt)) - token_count
+            token_count += difference
+            if token_count > max_tokens:
+                while context_entries and token_count > max_tokens:
+                    context_entries.pop()
+                    doc_ids.pop()
+                    token_count -= costs.pop()
+                prompt = prefix + self.separator.join(context_entries) + self.suffix
+        return BuiltPrompt(prompt, token_count, doc_ids)
@@ -2,7 +2,10 @@
 
 import requests
 import json
-import tiktoken
+
+from bulk_indexer import BulkIndexer
+from prompt_builder import PromptBuilder, get_encoding
+from search_client import SearchClient, build_query
 
 
 # Base URL for Elasticsearch
@@ -32,8 +35,12 @@ try:
 except:
     pass
 
-# Create index with proper mapping
+# Create index with proper mapping; sorting segments by course keeps each
+# course's documents contiguous, so course-filtered queries read one range
 index_settings = {
+    "settings": {
+        "index": {"sort.field": "course", "sort.order": "asc"}
+    },
     "mappings": {
         "properties": {
             "course": {"type": "keyword"},
@@ -48,97 +55,55 @@ response = requests.put(f"{ES_URL}/course-questions",
                        data=json.dumps(index_settings))
 print(f"Index creation response: {response.status_code}")
 
-# Index documents
-for i, doc in enumerate(documents):
-    response = requests.post(f"{ES_URL}/course-questions/_doc", 
-                           headers={"Content-Type": "application/json"},
-                           data=json.dumps(doc))
-    if i % 100 == 0:
-        print(f"Indexed {i} documents...")
+# Index documents in _bulk batches
+indexer = BulkIndexer(ES_URL, "course-questions", batch_size=500, workers=4)
+bulk_stats = indexer.index_documents(
+    documents,
+    progress=lambda n: print(f"Indexed {n} documents..."),
+)
+for error in bulk_stats["errors"]:
+    print(f"Failed to index document: {error['status']} {error['error']}")
 
 print("Q2: The function used for adding data to Elasticsearch is 'index'")
 print("Answer: index")
 
+# Q3 and Q4 queries are sent together in one _msearch call
+search_client = SearchClient(ES_URL, "course-questions")
+
+query = build_query(
+    "How do execute a command on a Kubernetes pod?",
+    size=5,
+    fields=["question^4", "text"],
+)
+query_filtered = build_query(
+    "How do copy a file to a Docker container?",
+    size=3,
+    fields=["question^4", "text"],
+    course="machine-learning-zoomcamp",
+)
+search_results, search_results_filtered = search_client.msearch([query, query_filtered])
+
 # Q3: Search with boosting
 print("\nQ3: Searching with boosting...")
 
-query = {
-    "size": 5,
-    "query": {
-        "multi_match": {
-            "query": "How do execute a command on a Kubernetes pod?",
-            "fields": ["question^4", "text"],
-            "type": "best_fields"
-        }
-    }
-}
-
-response = requests.post(f"{ES_URL}/course-questions/_search", 
-                        headers={"Content-Type": "application/json"},
-                        data=json.dumps(query))
-search_results = response.json()
-top_score = search_results['hits']['hits'][0]['_score']
+top_score = search_results[0].score
 print(f"Q3: Top score: {top_score}")
 
 # Q4: Filtering by course
 print("\nQ4: Filtering by course...")
 
-query_filtered = {
-    "size": 3,
-    "query": {
-        "bool": {
-            "must": {
-                "multi_match": {
-                    "query": "How do copy a file to a Docker container?",
-                    "fields": ["question^4", "text"],
-                    "type": "best_fields"
-                }
-            },
-            "filter": {
-                "term": {
-                    "course": "machine-learning-zoomcamp"
-                }
-            }
-        }
-    }
-}
-
-response = requests.post(f"{ES_URL}/course-questions/_search", 
-                        headers={"Content-Type": "application/json"},
-                        data=json.dumps(query_filtered))
-search_results_filtered = response.json()
-third_question = search_results_filtered['hits']['hits'][2]['_source']['question']
+third_question = search_results_filtered[2].source['question']
 print(f"Q4: Third question: {third_question}")
 
 # Q5: Building a prompt
 print("\nQ5: Building a prompt...")
 
-context_template = """
-Q: {question}
-A: {text}
-""".strip()
-
-context_entries = []
-for hit in search_results_filtered['hits']['hits']:
-    doc = hit['_source']
-    context_entries.append(context_template.format(question=doc['question'], text=doc['text']))
-
-context = "\n\n".join(context_entries)
-
-prompt_template = """
-You're a course teaching assistant. Answer the QUESTION based on the CONTEXT from the FAQ database.
-Use only the facts from the CONTEXT when answering the QUESTION.
-
-QUESTION: {question}
-
-CONTEXT:
-{context}
-""".strip()
-
-prompt = prompt_template.format(
-    question="How do copy a file to a Docker container?",
-    context=context
+prompt_builder = PromptBuilder("gpt-4o")
+built = prompt_builder.build(
+    "How do copy a file to a Docker container?",
+    search_results_filtered,
 )
+prompt = built.prompt
 
 prompt_length = len(prompt)
 print(f"Q5: Prompt length: {prompt_length}")
@@ -146,7 +111,8 @@ print(f"Q5: Prompt length: {prompt_length}")
 # Q6: Token counting
 print("\nQ6: Counting tokens...")
 
-encoding = tiktoken.encoding_for_model("gpt-4o")
+encoding = get_encoding("gpt-4o")
 tokens = encoding.encode(prompt)
 token_count = len(tokens)
 print(f"Q6: Token count: {token_count}")
+print(f"Q6: Token count from the prompt builder: {built.token_count}")
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Elasticsearch search client
+Keeps a pooled keep-alive session and batches queries into _msearch calls
+"""
+
+import json
+from collections import namedtuple
+
+from bulk_indexer import chunked, make_session
+
+
+Hit = namedtuple("Hit", ["id", "score", "source"])
+
+
+def build_query(text, size=5, fields=("question^4", "text"), course=None,
+                match_type="best_fields"):
+    """
+    Build a multi_match search body, optionally filtered by course
+
+    Args:
+        text: Query string
+        size: Number of hits to return
+        fields: Fields to match, with optional ^boost suffix
+        course: Course name for a term filter, or None for no filter
+        match_type: multi_match type
+
+    Returns:
+        dict: Elasticsearch search body
+    """
+    multi_match = {
+        "multi_match": {
+            "query": text,
+            "fields": list(fields),
+            "type": match_type,
+        }
+    }
+    if course is None:
+        return {"size": size, "query": multi_match}
+
+    return {
+        "size": size,
+        "query": {
+            "bool": {
+                "must": multi_match,
+                "filter": {"term": {"course": course}},
+            }
+        }
+    }
+
+
+def parse_hits(response):
+    """Convert a search response into a list of Hit tuples"""
+    return [
+        Hit(hit.get("_id"), hit.get("_score"), hit.get("_source", {}))
+        for hit in response["hits"]["hits"]
+    ]
+
+
+class SearchClient:
+    def __init__(self, es_url, index_name, pool_size=10, batch_size=100, session=None):
+        self.es_url = es_url.rstrip("/")
+        self.index_name = index_name
+        self.batch_size = batch_size
+        self.session = session or make_session(pool_size=pool_size)
+
+    def search(self, query):
+        """Run a single search body and return its hits"""
+        response = self.session.post(
+            f"{self.es_url}/{self.index_name}/_search",
+            headers={"Content-Type": "application/json"},
+            data=json.dumps(query),
+        )
+        response.raise_for_status()
+        return parse_hits(response.json())
+
+    def _msearch_batch(self, queries):
+        lines = []
+        header = json.dumps({"index": self.index_name})
+        for query in queries:
+            lines.append(header)
+            lines.append(json.dumps(query))
+        body = "\n".join(lines) + "\n"
+
+        response = self.session.post(
+            f"{self.es_url}/_msearch",
+            headers={"Content-Type": "application/x-ndjson"},
+            data=body.encode("utf-8"),
+        )
+        response.raise_for_status()
+
+        results = []
+        for item in response.json()["responses"]:
+            if "error" in item:
+                raise RuntimeError(f"Search failed: {item['error']}")
+            results.append(parse_hits(item))
+        return results
+
+    def msearch(self, queries):
+        """
+        Run many search bodies through _msearch
+
+        Queries are sent batch_size at a time over the pooled session.
+
+        Args:
+            queries: List of search bodies (see build_query)
+
+        Returns:
+            list: One list of Hit tuples per query, in query order
+        """
+        results = []
+        for batch in chunked(queries, self.batch_size):
+            results.extend(self._msearch_batch(batch))
+        return results
+
+    def close(self):
+        self.session.close()
@@ -0,0 +1,42 @@
+import argparse
+import os
+import time
+
+from model_registry import current_rss
+from parallel_embed import embed_parallel
+
+
+def make_texts(n):
+    return [
+        f"Question {i}: can I still join the course after the start date? "
+        f"Answer: yes, homeworks can be submitted until the deadline number {i % 7}."
+        for i in range(n)
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Parallel embedding throughput per worker count")
+    parser.add_argument("--model", default="BAAI/bge-small-en")
+    parser.add_argument("--texts", type=int, default=5000)
+    parser.add_argument("--batch-size", type=int, default=128)
+    parser.add_argument("--workers", type=int, nargs="+",
+                        default=sorted({1, 2, 4, os.cpu_count() or 1}))
+    args = parser.parse_args()
+
+    texts = make_texts(args.texts)
+    baseline = None
+    for workers in args.workers:
+        start = time.perf_counter()
+        n = 0
+        for batch in embed_parallel(iter(texts), args.model, workers=workers,
+                                    batch_size=args.batch_size):
+            n += len(batch)
+        elapsed = time.perf_counter() - start
+        rate = n / elapsed
+        baseline = baseline or rate
+        print(f"workers={workers:<3} {elapsed:8.2f}s  {rate:8.0f} texts/sec  "
+              f"speedup {rate / baseline:5.2f}x  parent RSS {current_rss() / 2**20:.0f} MB")
+
+
+if __name__ == "__main__":
+    main()
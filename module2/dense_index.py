@@ -0,0 +1,103 @@
+import numpy as np
+
+
+def normalize_rows(matrix):
+    """L2-normalize rows as float32, leaving zero rows untouched"""
+    matrix = np.asarray(matrix, dtype=np.float32)
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+def write_memmap(path, vector_batches, dim):
+    """
+    Stream batches of vectors into a normalized float32 memmap on disk
+
+    Args:
+        path: Output file
+        vector_batches: Iterable of 2D arrays with dim columns
+        dim: Vector dimensionality
+
+    Returns:
+        int: Number of rows written
+    """
+    n_rows = 0
+    with open(path, "wb") as f:
+        for batch in vector_batches:
+            batch = normalize_rows(batch)
+            if batch.shape[1] != dim:
+                raise ValueError(f"Expected {dim} columns, got {batch.shape[1]}")
+            f.write(np.ascontiguousarray(batch).tobytes())
+            n_rows += len(batch)
+    return n_rows
+
+
+def top_k(scores, k):
+    """Indices and scores of the k best columns per row, best first"""
+    k = min(k, scores.shape[1])
+    if k < scores.shape[1]:
+        idx = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+    else:
+        idx = np.broadcast_to(np.arange(scores.shape[1]), scores.shape).copy()
+    part = np.take_along_axis(scores, idx, axis=1)
+    order = np.argsort(-part, axis=1, kind="stable")
+    return np.take_along_axis(idx, order, axis=1), np.take_along_axis(part, order, axis=1)
+
+
+class DenseIndex:
+    """In-process exact cosine search over a normalized float32 matrix.
+
+    A batch of queries is scored with one matrix multiply per chunk of rows
+    and the top k are selected with argpartition. With chunk_size set, the
+    matrix may be a memmap larger than RAM: only one chunk of rows is
+    paged in at a time.
+    """
+
+    def __init__(self, vectors, normalized=False, chunk_size=None):
+        if normalized:
+            self.matrix = vectors
+        else:
+            self.matrix = np.ascontiguousarray(normalize_rows(vectors))
+        self.chunk_size = chunk_size
+
+    @classmethod
+    def from_memmap(cls, path, dim, chunk_size=100_000):
+        """Open a matrix written by write_memmap without loading it into memory"""
+        matrix = np.memmap(path, dtype=np.float32, mode="r").reshape(-1, dim)
+        return cls(matrix, normalized=True, chunk_size=chunk_size)
+
+    def __len__(self):
+        return self.matrix.shape[0]
+
+    def search(self, queries, k=5):
+        """
+        Find the k most similar rows for each query
+
+        Args:
+            queries: Query vector or 2D array of query vectors
+            k: Number of results per query
+
+        Returns:
+            tuple: (indices, scores), each of shape (n_queries, k), best first
+        """
+        queries = normalize_rows(np.atleast_2d(queries))
+        n_rows = len(self)
+        chunk_size = self.chunk_size or n_rows
+
+        best_idx = None
+        best_scores = None
+        for start in range(0, n_rows, chunk_size):
+            chunk = np.asarray(self.matrix[start:start + chunk_size])
+            idx, scores = top_k(queries @ chunk.T, k)
+            idx += start
+            if best_idx is None:
+                best_idx, best_scores = idx, scores
+            else:
+                merged_idx, merged_scores = top_k(np.hstack([best_scores, scores]), k)
+                best_idx = np.take_along_axis(np.hstack([best_idx, idx]), merged_idx, axis=1)
+                best_scores = merged_scores
+
+        if best_idx is None:
+            empty = np.empty((len(queries), 0))
+            return empty.astype(np.int64), empty.astype(np.float32)
+        return best_idx, best_scores
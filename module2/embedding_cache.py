@@ -0,0 +1,148 @@
+import hashlib
+import json
+import os
+import re
+
+import numpy as np
+
+from model_registry import get_model
+from parallel_embed import embed_parallel
+
+
+_caches = {}
+
+
+def text_hash(text):
+    """Hash of the text used as the cache key within a model"""
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+
+class EmbeddingCache:
+    """Persistent embedding cache keyed by (model name, text hash).
+
+    Vectors live in a memory-mapped float32 matrix (<model>.f32) and the
+    hash -> row mapping in a JSON index file (<model>.index.json), one pair
+    of files per model inside cache_dir. The model is only fetched from the
+    shared registry when a lookup misses.
+    """
+
+    def __init__(self, model_name, cache_dir="embedding_cache", batch_size=256):
+        self.model_name = model_name
+        self.batch_size = batch_size
+
+        os.makedirs(cache_dir, exist_ok=True)
+        slug = re.sub(r"[^A-Za-z0-9_.-]+", "__", model_name)
+        self.matrix_path = os.path.join(cache_dir, slug + ".f32")
+        self.index_path = os.path.join(cache_dir, slug + ".index.json")
+
+        self.rows = {}
+        self.dim = None
+        self.capacity = 0
+        self.matrix = None
+        if os.path.exists(self.index_path):
+            with open(self.index_path) as f:
+                index = json.load(f)
+            self.rows = index["rows"]
+            self.dim = index["dim"]
+            self.capacity = index["capacity"]
+            self.matrix = np.memmap(self.matrix_path, dtype=np.float32, mode="r+",
+                                    shape=(self.capacity, self.dim))
+
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self.rows)
+
+    def _reserve(self, n_new):
+        """Grow the memmap so that n_new more rows fit"""
+        needed = len(self.rows) + n_new
+        if needed <= self.capacity:
+            return
+        new_capacity = max(needed, 2 * self.capacity, 1024)
+        if self.matrix is not None:
+            self.matrix.flush()
+            del self.matrix
+        with open(self.matrix_path, "ab") as f:
+            f.truncate(new_capacity * self.dim * 4)
+        self.capacity = new_capacity
+        self.matrix = np.memmap(self.matrix_path, dtype=np.float32, mode="r+",
+                                shape=(self.capacity, self.dim))
+
+    def _save_index(self):
+        tmp_path = self.index_path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({
+                "model": self.model_name,
+                "dim": self.dim,
+                "capacity": self.capacity,
+                "rows": self.rows,
+            }, f)
+        os.replace(tmp_path, self.index_path)
+
+    def _embed_batches(self, texts, workers):
+        if workers is not None and workers > 1:
+            yield from embed_parallel(texts, self.model_name, workers=workers,
+                                      batch_size=self.batch_size)
+            return
+        model = get_model(self.model_name)
+        for start in range(0, len(texts), self.batch_size):
+            batch = texts[start:start + self.batch_size]
+            yield np.asarray(list(model.embed(batch, batch_size=self.batch_size)),
+                             dtype=np.float32)
+
+    def _add(self, keys, texts, workers=None):
+        """Embed texts in batches and append them to the matrix"""
+        start = 0
+        for vectors in self._embed_batches(texts, workers):
+            batch_keys = keys[start:start + len(vectors)]
+            start += len(vectors)
+            if self.dim is None:
+                self.dim = vectors.shape[1]
+            self._reserve(len(batch_keys))
+
+            first_row = len(self.rows)
+            self.matrix[first_row:first_row + len(batch_keys)] = vectors
+            self.matrix.flush()
+            for offset, key in enumerate(batch_keys):
+                self.rows[key] = first_row + offset
+            # The index is written after the vectors so it never points at missing rows
+            self._save_index()
+
+    def embed(self, texts, workers=None):
+        """
+        Embed texts, using cached vectors where available
+
+        Args:
+            texts: List of strings
+            workers: Embed misses across this many processes (see parallel_embed)
+
+        Returns:
+            np.ndarray: float32 matrix with one row per text
+        """
+        keys = [text_hash(t) for t in texts]
+
+        missing = {}
+        for key, text in zip(keys, texts):
+            if key not in self.rows and key not in missing:
+                missing[key] = text
+        self.misses += len(missing)
+        self.hits += len(keys) - len(missing)
+
+        if missing:
+            self._add(list(missing.keys()), list(missing.values()), workers=workers)
+
+        if not keys:
+            return np.empty((0, self.dim or 0), dtype=np.float32)
+        return np.asarray(self.matrix[[self.rows[k] for k in keys]])
+
+    def embed_one(self, text):
+        return self.embed([text])[0]
+
+
+def get_cache(model_name, cache_dir="embedding_cache"):
+    """Return the shared EmbeddingCache for a model, so callers never race on its files"""
+    key = (model_name, os.path.abspath(cache_dir))
+    if key not in _caches:
+        _caches[key] = EmbeddingCache(model_name, cache_dir=cache_dir)
+    return _caches[key]
@@ -0,0 +1,110 @@
+import gc
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from fastembed import TextEmbedding
+
+
+def current_rss():
+    """Resident set size of this process in bytes (0 where unavailable)"""
+    try:
+        with open("/proc/self/statm") as f:
+            pages = int(f.read().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return 0
+
+
+class ModelRegistry:
+    """Process-wide registry of embedding models.
+
+    Models are loaded on first use and shared by every caller. When the
+    summed resident size of the loaded models exceeds max_memory_mb, the
+    least recently used models are evicted.
+    """
+
+    def __init__(self, max_memory_mb=None, loader=None):
+        self.max_memory_mb = max_memory_mb
+        self.loader = loader or (lambda name: TextEmbedding(model_name=name))
+        self.models = OrderedDict()
+        self.info = {}
+        self.lock = threading.RLock()
+
+    def get(self, model_name):
+        """Return the shared model instance, loading it on first use"""
+        with self.lock:
+            if model_name in self.models:
+                self.models.move_to_end(model_name)
+                self.info[model_name]["uses"] += 1
+                return self.models[model_name]
+
+            rss_before = current_rss()
+            start = time.perf_counter()
+            model = self.loader(model_name)
+            load_time = time.perf_counter() - start
+            resident = max(current_rss() - rss_before, 0)
+
+            self.models[model_name] = model
+            self.info[model_name] = {
+                "load_time": load_time,
+                "resident_mb": resident / 2**20,
+                "loads": self.info.get(model_name, {}).get("loads", 0) + 1,
+                "uses": 1,
+            }
+            self._evict(keep=model_name)
+            return model
+
+    def _evict(self, keep):
+        if self.max_memory_mb is None:
+            return
+        while self.resident_mb() > self.max_memory_mb and len(self.models) > 1:
+            oldest = next(iter(self.models))
+            if oldest == keep:
+                break
+            self.unload(oldest)
+
+    def unload(self, model_name):
+        """Drop a model so its memory can be reclaimed"""
+        with self.lock:
+            if self.models.pop(model_name, None) is not None:
+                gc.collect()
+
+    def resident_mb(self):
+        """Summed resident size of the loaded models"""
+        return sum(self.info[name]["resident_mb"] for name in self.models)
+
+    def stats(self):
+        """Load time, resident size and usage counters per model"""
+        with self.lock:
+            return {
+                name: dict(info, loaded=name in self.models)
+                for name, info in self.info.items()
+            }
+
+    def report(self):
+        for name, info in self.stats().items():
+            state = "loaded" if info["loaded"] else "evicted"
+            print(f"{name}: {state}, load {info['load_time']:.2f}s, "
+                  f"{info['resident_mb']:.0f} MB, {info['loads']} loads, {info['uses']} uses")
+
+
+# Default cap on the summed resident size of loaded models; override with
+# MODEL_REGISTRY_MAX_MB (0 disables eviction)
+DEFAULT_MAX_MEMORY_MB = 2048
+
+
+def max_memory_from_env(default=DEFAULT_MAX_MEMORY_MB):
+    """Memory cap in MB from MODEL_REGISTRY_MAX_MB, None when set to 0"""
+    value = os.environ.get("MODEL_REGISTRY_MAX_MB")
+    max_memory_mb = default if value in (None, "") else float(value)
+    return max_memory_mb if max_memory_mb > 0 else None
+
+
+registry = ModelRegistry(max_memory_mb=max_memory_from_env())
+
+
+def get_model(model_name):
+    """Shared model instance from the process-wide registry"""
+    return registry.get(model_name)
@@ -0,0 +1,68 @@
+import multiprocessing
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+import numpy as np
+from fastembed import TextEmbedding
+
+
+_worker_model = None
+
+
+def _init_worker(model_name, threads):
+    """Load one model per worker process"""
+    global _worker_model
+    _worker_model = TextEmbedding(model_name=model_name, threads=threads)
+
+
+def _embed_batch(texts):
+    return np.asarray(list(_worker_model.embed(texts, batch_size=len(texts))), dtype=np.float32)
+
+
+def batched(iterable, size):
+    iterator = iter(iterable)
+    while True:
+        batch = list(islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
+
+def embed_parallel(texts, model_name, workers=None, batch_size=256, max_pending=None,
+                   threads_per_worker=1):
+    """
+    Embed a stream of texts across a process pool
+
+    Texts are sharded into batches and each worker process runs its own
+    model. Batches are yielded in input order, and at most max_pending
+    batches are in flight, so memory stays flat for any corpus size as
+    long as the consumer keeps up.
+
+    Args:
+        texts: Iterable of strings (may be a generator)
+        model_name: fastembed model name
+        workers: Number of worker processes (defaults to the CPU count)
+        batch_size: Texts per batch sent to a worker
+        max_pending: Batches in flight at once (defaults to 2 * workers)
+        threads_per_worker: ONNX runtime threads per worker
+
+    Yields:
+        np.ndarray: float32 embeddings, one batch at a time
+    """
+    workers = workers or os.cpu_count() or 1
+    max_pending = max_pending or 2 * workers
+
+    # spawn avoids forking a parent that may already hold an ONNX session
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context,
+                             initializer=_init_worker,
+                             initargs=(model_name, threads_per_worker)) as executor:
+        pending = deque()
+        for batch in batched(texts, batch_size):
+            pending.append(executor.submit(_embed_batch, batch))
+            if len(pending) >= max_pending:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
@@ -1,16 +1,21 @@
+import os
+
 import numpy as np
 import requests
 from fastembed import TextEmbedding
 from qdrant_client import QdrantClient
 from qdrant_client.http.models import VectorParams, Distance
 
+from dense_index import DenseIndex
+from embedding_cache import get_cache
+from model_registry import registry
+
 
 def q1_get_query_embedding():
     """Q1 – embed the query and report min value."""
     query = "I just discovered the course. Can I join now?"
     model_name = "jinaai/jina-embeddings-v2-small-en"
-    embedder = TextEmbedding(model_name=model_name)
-    embedding = next(embedder.embed([query]))
+    embedding = get_cache(model_name).embed_one(query)
     print("Q1 – min value in embedding:", round(np.min(embedding), 2))
     return embedding
 
@@ -19,8 +24,7 @@ def q2_similarity(query_vec):
     """Q2 – cosine similarity between query and doc embedding."""
     doc_text = "Can I still join the course after the start date?"
     model_name = "jinaai/jina-embeddings-v2-small-en"
-    embedder = TextEmbedding(model_name=model_name)
-    doc_vec = next(embedder.embed([doc_text]))
+    doc_vec = get_cache(model_name).embed_one(doc_text)
     sim = float(np.dot(query_vec, doc_vec))
     print("Q2 – cosine similarity:", round(sim, 1))
 
@@ -55,19 +59,17 @@ Don't forget to register in DataTalks.Club's Slack and join the channel.""",
          "course": "data-engineering-zoomcamp"}
     ]
     model_name = "jinaai/jina-embeddings-v2-small-en"
-    embedder = TextEmbedding(model_name=model_name)
+    cache = get_cache(model_name)
 
     # Q3 – use only text field
-    V_text = np.array(list(embedder.embed([d["text"] for d in documents])))
-    sims_text = V_text.dot(query_vec)
-    best_q3 = int(np.argmax(sims_text))
+    index_text = DenseIndex(cache.embed([d["text"] for d in documents]))
+    best_q3 = int(index_text.search(query_vec, k=1)[0][0, 0])
     print("Q3 – best doc index (text only):", best_q3)
 
     # Q4 – use question + text
     full_texts = [d["question"] + " " + d["text"] for d in documents]
-    V_full = np.array(list(embedder.embed(full_texts)))
-    sims_full = V_full.dot(query_vec)
-    best_q4 = int(np.argmax(sims_full))
+    index_full = DenseIndex(cache.embed(full_texts))
+    best_q4 = int(index_full.search(query_vec, k=1)[0][0, 0])
     print("Q4 – best doc index (question+text):", best_q4)
 
 
@@ -83,7 +85,7 @@ def q6_qdrant_demo(query_str):
     """Q6 – index ML Zoomcamp FAQ docs into in-memory Qdrant and query."""
     # pick the 384-dim BGE small
     model_name = "BAAI/bge-small-en"
-    embedder = TextEmbedding(model_name=model_name)
+    cache = get_cache(model_name)
 
     # download documents
     url = "https://github.com/alexeygrigorev/llm-rag-workshop/raw/main/notebooks/documents.json"
@@ -95,7 +97,8 @@ def q6_qdrant_demo(query_str):
         for d in course["documents"]:
             records.append({"text": d["question"] + " " + d["text"], "payload": d})
 
-    vectors = list(embedder.embed([r["text"] for r in records]))
+    # misses are sharded across one model per CPU core
+    vectors = cache.embed([r["text"] for r in records], workers=os.cpu_count())
 
     client = QdrantClient(":memory:")
     dim = len(vectors[0])
@@ -110,7 +113,7 @@ def q6_qdrant_demo(query_str):
         payload=[r["payload"] for r in records],
     )
 
-    q_vec = next(embedder.embed([query_str]))
+    q_vec = cache.embed_one(query_str)
     hit = client.search("ml_zoomcamp_faq", q_vec, limit=1)[0]
     print("Q6 – highest score:", round(hit.score, 2))
 
@@ -120,4 +123,5 @@ if __name__ == "__main__":
     q2_similarity(query_embedding)
     q3_q4_ranking(query_embedding)
     q5_smallest_dimension()
-    q6_qdrant_demo("I just discovered the course. Can I join now?") 
\ No newline at end of file
+    q6_qdrant_demo("I just discovered the course. Can I join now?")
+    registry.report() 
\ No newline at end of file
@@ -0,0 +1,220 @@
+import asyncio
+import itertools
+import json
+from collections import deque
+
+from mcp_client import MCPError, MCPTools
+
+
+class AsyncMCPClient:
+    """
+    asyncio MCP client over a stdio JSON-RPC pipe
+
+    Same protocol handling as MCPClient: increasing request ids, a reader
+    task resolving futures by id, per-call timeouts. Awaiting a response
+    never blocks the event loop, so tool calls can run concurrently.
+    """
+
+    def __init__(self, command, timeout=30):
+        self.command = command
+        self.timeout = timeout
+        self.process = None
+        self.notifications = deque(maxlen=100)
+        self.stderr_lines = deque(maxlen=100)
+        self._ids = itertools.count(1)
+        self._pending = {}
+        self._tasks = []
+
+    async def start_server(self):
+        """Start the MCP server process"""
+        self.process = await asyncio.create_subprocess_exec(
+            *self.command,
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+            limit=2 ** 24,
+        )
+        self._tasks = [
+            asyncio.create_task(self._read_loop()),
+            asyncio.create_task(self._drain_stderr()),
+        ]
+
+    async def _write(self, message):
+        if self.process is None:
+            raise MCPError("Server not started")
+        try:
+            self.process.stdin.write((json.dumps(message) + '\n').encode())
+            await self.process.stdin.drain()
+        except (BrokenPipeError, ConnectionResetError) as e:
+            raise MCPError(f"Server is not accepting requests: {e}") from e
+
+    async def _read_loop(self):
+        try:
+            while True:
+                line = await self.process.stdout.readline()
+                if not line:
+                    break
+                try:
+                    message = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                await self._dispatch(message)
+        finally:
+            # Fail every waiting call on any exit, so callers never hang
+            pending, self._pending = self._pending, {}
+            for future in pending.values():
+                if not future.done():
+                    future.set_exception(MCPError("Server closed the connection"))
+
+    async def _dispatch(self, message):
+        if 'method' in message:
+            if 'id' not in message:
+                self.notifications.append(message)
+            else:
+                await self._handle_server_request(message)
+            return
+
+        future = self._pending.pop(message.get('id'), None)
+        if future is not None and not future.done():
+            future.set_result(message)
+
+    async def _handle_server_request(self, message):
+        """Answer requests the server sends to the client"""
+        if message['method'] == 'ping':
+            response = {"jsonrpc": "2.0", "id": message['id'], "result": {}}
+        else:
+            response = {
+                "jsonrpc": "2.0",
+                "id": message['id'],
+                "error": {"code": -32601, "message": f"Method not found: {message['method']}"}
+            }
+        try:
+            await self._write(response)
+        except MCPError:
+            pass
+
+    async def _drain_stderr(self):
+        while True:
+            line = await self.process.stderr.readline()
+            if not line:
+                break
+            self.stderr_lines.append(line.decode(errors='replace').rstrip('\n'))
+
+    async def _send_request(self, request, timeout=None):
+        """Send a JSON-RPC request and await its response"""
+        request_id = next(self._ids)
+        future = asyncio.get_running_loop().create_future()
+        self._pending[request_id] = future
+        timeout = self.timeout if timeout is None else timeout
+        try:
+            await self._write({**request, "id": request_id})
+            return await asyncio.wait_for(future, timeout)
+        except asyncio.TimeoutError:
+            raise MCPError(f"Request {request_id} timed out after {timeout}s") from None
+        finally:
+            self._pending.pop(request_id, None)
+
+    async def initialize(self):
+        """Initialize the MCP session"""
+        init_request = {
+            "jsonrpc": "2.0",
+            "method": "initialize",
+            "params": {
+                "protocolVersion": "2024-11-05",
+                "capabilities": {
+                    "roots": {"listChanged": True},
+                    "sampling": {}
+                },
+                "clientInfo": {
+                    "name": "test-client",
+                    "version": "1.0.0"
+                }
+            }
+        }
+        return await self._send_request(init_request)
+
+    async def initialized(self):
+        """Send initialized notification"""
+        await self._write({
+            "jsonrpc": "2.0",
+            "method": "notifications/initialized"
+        })
+
+    async def get_tools(self):
+        """Get list of available tools"""
+        return await self._send_request({
+            "jsonrpc": "2.0",
+            "method": "tools/list"
+        })
+
+    async def call_tool(self, name, arguments, timeout=None):
+        """Call a specific tool"""
+        call_request = {
+            "jsonrpc": "2.0",
+            "method": "tools/call",
+            "params": {
+                "name": name,
+                "arguments": arguments
+            }
+        }
+        return await self._send_request(call_request, timeout)
+
+    async def close(self):
+        """Close the MCP client"""
+        if self.process:
+            if self.process.returncode is None:
+                self.process.terminate()
+            await self.process.wait()
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+
+
+class AsyncMCPTools(MCPTools):
+    """MCPTools for an AsyncMCPClient: get_tools and function_call are coroutines"""
+
+    async def get_tools(self):
+        if self.tools is None:
+            mcp_tools = await self.mcp_client.get_tools()
+            self.tools = self.convert_tools_list(mcp_tools)
+        return self.tools
+
+    async def function_call(self, tool_call_response):
+        function_name = tool_call_response.name
+        arguments = json.loads(tool_call_response.arguments)
+
+        result = await self.mcp_client.call_tool(function_name, arguments)
+
+        return {
+            "type": "function_call_output",
+            "call_id": tool_call_response.call_id,
+            "output": json.dumps(result, indent=2),
+        }
+
+
+async def main():
+    client = AsyncMCPClient(["python3", "weather_server.py"])
+    try:
+        await client.start_server()
+        print("Server started")
+
+        init_result = await client.initialize()
+        print("Initialize result:", init_result)
+        await client.initialized()
+
+        tools = await client.get_tools()
+        print("Available tools:", json.dumps(tools, indent=2))
+
+        # Independent calls run concurrently; results come back in call order
+        cities = ["Berlin", "Paris", "Tokyo"]
+        responses = await asyncio.gather(*[
+            client.call_tool("get_weather", {"city": city}) for city in cities
+        ])
+        for city, response in zip(cities, responses):
+            print(f"{city} weather:", response)
+    except Exception as e:
+        print(f"Error: {e}")
+    finally:
+        await client.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -1,9 +1,13 @@
 
+import asyncio
+import inspect
 import json
 
 from IPython.display import display, HTML
 import markdown
 
+from conversation import ConversationContext
+
 class Tools:
     def __init__(self):
         self.tools = {}
@@ -75,11 +79,18 @@ class ChatInterface:
 
 
 class ChatAssistant:
-    def __init__(self, tools, developer_prompt, chat_interface, client):
+    def __init__(self, tools, developer_prompt, chat_interface, client, context_options=None):
         self.tools = tools
         self.developer_prompt = developer_prompt
         self.chat_interface = chat_interface
         self.client = client
+        # ConversationContext options, e.g. {'budget_tokens': 4000, 'summarizer': outline_summary}
+        self.context_options = context_options or {}
+        self.context = None
+
+    def new_context(self):
+        self.context = ConversationContext(self.developer_prompt, **self.context_options)
+        return self.context
     
     def gpt(self, chat_messages):
         return self.client.responses.create(
@@ -90,9 +101,7 @@ class ChatAssistant:
 
 
     def run(self):
-        chat_messages = [
-            {"role": "developer", "content": self.developer_prompt},
-        ]
+        context = self.new_context()
 
         # Chat loop
         while True:
@@ -102,19 +111,18 @@ class ChatAssistant:
                 break
 
             message = {"role": "user", "content": question}
-            chat_messages.append(message)
+            context.add(message)
 
             while True:  # inner request loop
-                response = self.gpt(chat_messages)
+                response = self.gpt(context.messages())
 
                 has_messages = False
 
                 for entry in response.output:
-                    chat_messages.append(entry)
+                    context.add(entry)
 
                     if entry.type == "function_call":
-                        result = self.tools.function_call(entry)
-                        chat_messages.append(result)
+                        result = context.add(self.tools.function_call(entry))
                         self.chat_interface.display_function_call(entry, result)
 
                     elif entry.type == "message":
@@ -123,6 +131,65 @@ class ChatAssistant:
 
                 if has_messages:
                     break
-    
 
 
+class AsyncChatAssistant(ChatAssistant):
+    """
+    ChatAssistant for an async OpenAI client (e.g. AsyncOpenAI)
+
+    The function calls of one response are started together and their outputs
+    are added in the original order, so a multi-tool turn takes as long as the
+    slowest tool. tools.function_call may be a coroutine (AsyncMCPTools);
+    plain functions (Tools) run in worker threads.
+    """
+
+    async def gpt(self, chat_messages):
+        tools = self.tools.get_tools()
+        if inspect.isawaitable(tools):
+            tools = await tools
+        return await self.client.responses.create(
+            model='gpt-4o-mini',
+            input=chat_messages,
+            tools=tools,
+        )
+
+    async def function_call(self, entry):
+        if inspect.iscoroutinefunction(self.tools.function_call):
+            return await self.tools.function_call(entry)
+        return await asyncio.to_thread(self.tools.function_call, entry)
+
+    async def run(self):
+        context = self.new_context()
+
+        # Chat loop
+        while True:
+            question = await asyncio.to_thread(self.chat_interface.input)
+            if question.strip().lower() == 'stop':
+                self.chat_interface.display("Chat ended.")
+                break
+
+            message = {"role": "user", "content": question}
+            context.add(message)
+
+            while True:  # inner request loop
+                response = await self.gpt(context.messages())
+
+                calls = [entry for entry in response.output if entry.type == "function_call"]
+                results = await asyncio.gather(*[self.function_call(entry) for entry in calls])
+                results = {id(entry): result for entry, result in zip(calls, results)}
+
+                has_messages = False
+
+                for entry in response.output:
+                    context.add(entry)
+
+                    if entry.type == "function_call":
+                        result = context.add(results[id(entry)])
+                        self.chat_interface.display_function_call(entry, result)
+
+                    elif entry.type == "message":
+                        self.chat_interface.display_response(entry)
+                        has_messages = True
+
+                if has_messages:
+                    break
@@ -0,0 +1,148 @@
+import json
+
+
+def approx_tokens(text):
+    """Rough token count (~4 characters per token); pass a tiktoken-based counter for exact counts"""
+    return (len(text) + 3) // 4
+
+
+def entry_type(entry):
+    if isinstance(entry, dict):
+        return entry.get('type') or 'message'
+    return entry.type
+
+
+def entry_text(entry):
+    """Text of a conversation entry that is sent to the model"""
+    if isinstance(entry, dict):
+        if entry.get('type') == 'function_call_output':
+            return entry['output']
+        content = entry.get('content', '')
+        return content if isinstance(content, str) else json.dumps(content)
+    if entry.type == 'function_call':
+        return entry.name + entry.arguments
+    if entry.type == 'message':
+        return ''.join(getattr(part, 'text', '') for part in entry.content)
+    return ''
+
+
+def compact_output(output, max_chars):
+    """Minify a JSON tool output and truncate it to max_chars"""
+    try:
+        output = json.dumps(json.loads(output), separators=(',', ':'), ensure_ascii=False)
+    except (TypeError, ValueError):
+        pass
+    if max_chars is not None and len(output) > max_chars:
+        dropped = len(output) - max_chars
+        output = output[:max_chars] + f"...[truncated {dropped} chars]"
+    return output
+
+
+def outline_summary(entries, previous=None, max_chars=1500):
+    """
+    Summarizer that needs no model call: one short line per removed entry
+
+    Keeps the most recent lines when the outline grows past max_chars.
+    """
+    lines = previous.split('\n') if previous else []
+    for entry in entries:
+        kind = entry_type(entry)
+        if kind == 'function_call':
+            lines.append(f"called {entry.name}({entry.arguments[:80]})")
+        elif kind == 'function_call_output':
+            lines.append(f"tool result: {entry['output'][:80]}")
+        else:
+            role = entry.get('role', 'assistant') if isinstance(entry, dict) else 'assistant'
+            lines.append(f"{role}: {entry_text(entry)[:120]}")
+    while len(lines) > 1 and len('\n'.join(lines)) > max_chars:
+        lines.pop(0)
+    return '\n'.join(lines)
+
+
+class ConversationContext:
+    """
+    Chat history kept within a token budget
+
+    Entries are grouped into turns (a user message and everything the model
+    and tools add until the next user message). Token counts are computed
+    once per entry when it is added. Tool outputs are minified and truncated
+    on the way in. When the total exceeds `budget_tokens`, the oldest turns
+    are removed (keeping at least `keep_turns`); with a summarizer they are
+    folded into a running summary message instead of being dropped.
+
+    Args:
+        developer_prompt: Pinned first message
+        budget_tokens: Target size of messages() in tokens
+        max_tool_output_chars: Longest tool output kept (None for no limit)
+        keep_turns: Most recent turns that are never removed
+        count_tokens: Function text -> tokens
+        summarizer: Optional function (removed entries, previous summary) -> summary text
+    """
+
+    def __init__(self, developer_prompt, budget_tokens=8000, max_tool_output_chars=2000,
+                 keep_turns=1, count_tokens=approx_tokens, summarizer=None):
+        self.developer = {"role": "developer", "content": developer_prompt}
+        self.budget_tokens = budget_tokens
+        self.max_tool_output_chars = max_tool_output_chars
+        self.keep_turns = keep_turns
+        self.count_tokens = count_tokens
+        self.summarizer = summarizer
+
+        self.developer_tokens = count_tokens(developer_prompt)
+        self.summary = None
+        self.summary_tokens = 0
+        self.turns = []  # lists of (entry, tokens)
+        self.total_tokens = self.developer_tokens
+        self.dropped_turns = 0
+
+    def add(self, entry):
+        """Add an entry (user message, model output item or tool result); returns the stored entry"""
+        if entry_type(entry) == 'function_call_output':
+            entry = {**entry, 'output': compact_output(entry['output'], self.max_tool_output_chars)}
+        is_user = isinstance(entry, dict) and entry.get('role') == 'user'
+        if is_user or not self.turns:
+            self.turns.append([])
+
+        tokens = self.count_tokens(entry_text(entry))
+        self.turns[-1].append((entry, tokens))
+        self.total_tokens += tokens
+        self.fit()
+        return entry
+
+    def turn_tokens(self, turn):
+        return sum(tokens for _, tokens in turn)
+
+    def fit(self):
+        """Remove or summarize the oldest turns until the budget is met"""
+        removed = []
+        while self.total_tokens > self.budget_tokens and len(self.turns) > self.keep_turns:
+            turn = self.turns.pop(0)
+            self.total_tokens -= self.turn_tokens(turn)
+            removed.extend(entry for entry, _ in turn)
+            self.dropped_turns += 1
+
+        if removed and self.summarizer is not None:
+            self.summary = self.summarizer(removed, self.summary)
+            self.total_tokens -= self.summary_tokens
+            self.summary_tokens = self.count_tokens(self.summary)
+            self.total_tokens += self.summary_tokens
+
+    def messages(self):
+        """Entries to send to the model"""
+        messages = [self.developer]
+        if self.summary:
+            messages.append({
+                "role": "developer",
+                "content": f"Summary of the earlier conversation:\n{self.summary}"
+            })
+        for turn in self.turns:
+            messages.extend(entry for entry, _ in turn)
+        return messages
+
+    def stats(self):
+        return {
+            'total_tokens': self.total_tokens,
+            'turns': len(self.turns),
+            'dropped_turns': self.dropped_turns,
+            'summary_tokens': self.summary_tokens,
+        }
@@ -1,11 +1,37 @@
 import subprocess
 import json
 import sys
+import itertools
+import threading
+from collections import deque
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+
+
+class MCPError(RuntimeError):
+    """Transport failure: server not started, exited, or a request timed out"""
+
 
 class MCPClient:
-    def __init__(self, command):
+    """
+    Synchronous MCP client over a stdio JSON-RPC pipe
+
+    Requests get increasing ids and a Future each; a background thread reads
+    the server's stdout and resolves futures by id, so replies may arrive in
+    any order and many requests can be in flight on one pipe. Notifications
+    and requests sent by the server are handled by the reader as well.
+    """
+
+    def __init__(self, command, timeout=30):
         self.command = command
+        self.timeout = timeout
         self.process = None
+        self.notifications = deque(maxlen=100)
+        self.stderr_lines = deque(maxlen=100)
+        self._ids = itertools.count(1)
+        self._pending = {}
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._reader = None
 
     def start_server(self):
         """Start the MCP server process"""
@@ -15,29 +41,113 @@ class MCPClient:
             stdout=subprocess.PIPE,
             stderr=subprocess.PIPE,
             text=True,
-            bufsize=0
+            bufsize=1
         )
+        self._reader = threading.Thread(target=self._read_loop, daemon=True)
+        self._reader.start()
+        # Drain stderr so a chatty server never blocks on a full pipe
+        threading.Thread(target=self._drain_stderr, daemon=True).start()
 
-    def _send_request(self, request):
-        """Send a JSON-RPC request to the server"""
+    def _write(self, message):
         if self.process is None:
-            raise RuntimeError("Server not started")
-        
-        request_json = json.dumps(request) + '\n'
-        self.process.stdin.write(request_json)
-        self.process.stdin.flush()
-        
-        # Read response
-        response_line = self.process.stdout.readline()
-        if response_line:
-            return json.loads(response_line.strip())
-        return None
+            raise MCPError("Server not started")
+        with self._write_lock:
+            try:
+                self.process.stdin.write(json.dumps(message) + '\n')
+                self.process.stdin.flush()
+            except (BrokenPipeError, ValueError) as e:
+                raise MCPError(f"Server is not accepting requests: {e}") from e
+
+    def _read_loop(self):
+        for line in self.process.stdout:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                message = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            self._dispatch(message)
+
+        # The server exited: nothing will answer the requests still in flight
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        for future in pending.values():
+            if not future.done():
+                future.set_exception(MCPError("Server closed the connection"))
+
+    def _dispatch(self, message):
+        if 'method' in message:
+            if 'id' in message:
+                self._handle_server_request(message)
+            else:
+                self.notifications.append(message)
+            return
+
+        with self._lock:
+            future = self._pending.pop(message.get('id'), None)
+        if future is not None and not future.done():
+            future.set_result(message)
+
+    def _handle_server_request(self, message):
+        """Answer requests the server sends to the client"""
+        if message['method'] == 'ping':
+            response = {"jsonrpc": "2.0", "id": message['id'], "result": {}}
+        else:
+            response = {
+                "jsonrpc": "2.0",
+                "id": message['id'],
+                "error": {"code": -32601, "message": f"Method not found: {message['method']}"}
+            }
+        try:
+            self._write(response)
+        except MCPError:
+            pass
+
+    def _drain_stderr(self):
+        for line in self.process.stderr:
+            self.stderr_lines.append(line.rstrip('\n'))
+
+    def send_request_async(self, request):
+        """
+        Send a JSON-RPC request without waiting for the reply
+
+        The request gets the next id (any id in the request is replaced).
+
+        Returns:
+            Future: Resolves to the response dict
+        """
+        future = Future()
+        with self._lock:
+            request_id = next(self._ids)
+            self._pending[request_id] = future
+        try:
+            self._write({**request, "id": request_id})
+        except MCPError:
+            with self._lock:
+                self._pending.pop(request_id, None)
+            raise
+        future.request_id = request_id
+        return future
+
+    def wait(self, future, timeout=None):
+        """Response of a request future, raising MCPError after the timeout"""
+        timeout = self.timeout if timeout is None else timeout
+        try:
+            return future.result(timeout=timeout)
+        except FutureTimeoutError:
+            with self._lock:
+                self._pending.pop(future.request_id, None)
+            raise MCPError(f"Request {future.request_id} timed out after {timeout}s") from None
+
+    def _send_request(self, request, timeout=None):
+        """Send a JSON-RPC request to the server and wait for its response"""
+        return self.wait(self.send_request_async(request), timeout)
 
     def initialize(self):
         """Initialize the MCP session"""
         init_request = {
             "jsonrpc": "2.0",
-            "id": 1,
             "method": "initialize",
             "params": {
                 "protocolVersion": "2024-11-05",
@@ -59,36 +169,57 @@ class MCPClient:
             "jsonrpc": "2.0",
             "method": "notifications/initialized"
         }
-        self.process.stdin.write(json.dumps(notification) + '\n')
-        self.process.stdin.flush()
+        self._write(notification)
 
     def get_tools(self):
         """Get list of available tools"""
         tools_request = {
             "jsonrpc": "2.0",
-            "id": 2,
             "method": "tools/list"
         }
         return self._send_request(tools_request)
 
-    def call_tool(self, name, arguments):
-        """Call a specific tool"""
+    def call_tool_async(self, name, arguments):
+        """Send a tools/call request and return its Future"""
         call_request = {
             "jsonrpc": "2.0",
-            "id": 3,
             "method": "tools/call",
             "params": {
                 "name": name,
                 "arguments": arguments
             }
         }
-        return self._send_request(call_request)
+        return self.send_request_async(call_request)
+
+    def call_tool(self, name, arguments, timeout=None):
+        """Call a specific tool"""
+        return self.wait(self.call_tool_async(name, arguments), timeout)
+
+    def call_tools(self, calls, timeout=None):
+        """
+        Pipeline several tool calls over the pipe
+
+        Args:
+            calls: List of (name, arguments) pairs
+
+        Returns:
+            list: Responses in the order of calls
+        """
+        futures = [self.call_tool_async(name, arguments) for name, arguments in calls]
+        return [self.wait(future, timeout) for future in futures]
 
     def close(self):
         """Close the MCP client"""
         if self.process:
             self.process.terminate()
             self.process.wait()
+            if self._reader is not None:
+                self._reader.join(timeout=1)
+            for pipe in (self.process.stdin, self.process.stdout, self.process.stderr):
+                try:
+                    pipe.close()
+                except (OSError, ValueError):
+                    pass
 
 
 class MCPTools:
@@ -155,6 +286,12 @@ if __name__ == "__main__":
         berlin_weather = client.call_tool("get_weather", {"city": "Berlin"})
         print("Berlin weather:", berlin_weather)
         
+        # Pipeline several calls over the same pipe
+        cities = ["Berlin", "Paris", "Tokyo"]
+        responses = client.call_tools([("get_weather", {"city": c}) for c in cities])
+        for city, response in zip(cities, responses):
+            print(f"{city} weather:", response)
+        
     except Exception as e:
         print(f"Error: {e}")
     finally:
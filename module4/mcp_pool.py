@@ -0,0 +1,318 @@
+import itertools
+import json
+import sys
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from mcp_client import MCPClient, MCPError, MCPTools
+
+
+def city_affinity(name, arguments):
+    """weather_server.py keeps temperatures per city: route calls by city"""
+    city = arguments.get('city')
+    return None if city is None else str(city).strip().lower()
+
+
+def is_error_response(response):
+    return 'error' in response or bool(response.get('result', {}).get('isError'))
+
+
+class PoolWorker:
+    """One MCP server process with the handshake done"""
+
+    def __init__(self, command, timeout, slot):
+        self.client = MCPClient(command, timeout=timeout)
+        self.slot = slot
+        self.in_flight = 0
+        self.calls = 0
+        self.spawn_time = None
+        self.handshake_time = None
+
+    def start(self):
+        start = time.perf_counter()
+        self.client.start_server()
+        self.spawn_time = time.perf_counter() - start
+
+        # Interpreter startup and server imports finish before the reply arrives
+        start = time.perf_counter()
+        response = self.client.initialize()
+        if response is None or 'result' not in response:
+            raise MCPError(f"Initialize failed: {response}")
+        self.client.initialized()
+        self.handshake_time = time.perf_counter() - start
+        return self
+
+    @property
+    def pid(self):
+        return self.client.process.pid
+
+    def alive(self):
+        return self.client.process is not None and self.client.process.poll() is None
+
+    def ping(self, timeout):
+        try:
+            response = self.client._send_request({"jsonrpc": "2.0", "method": "ping"}, timeout)
+        except MCPError:
+            return False
+        return 'result' in response
+
+    def close(self):
+        self.client.close()
+
+
+class MCPServerPool:
+    """
+    Pool of pre-initialized MCP server processes
+
+    start() launches `size` servers in parallel and completes the MCP
+    handshake on each, so sessions never wait for interpreter startup.
+
+    Servers can keep state in memory (weather_server.py stores set_weather
+    temperatures), so calls are routed by `affinity(name, arguments)`: calls
+    with the same key always go to the same worker, which sees every write
+    for that key before the reads that follow it. Calls without a key go to
+    the worker with the fewest calls in flight. Write tools must have a key,
+    otherwise call_tool raises MCPError.
+
+    A dead worker is respawned in a background thread; only calls routed to
+    its slot wait for the new process, the others keep using live workers.
+    A fresh server starts with empty state, so the pool replays the last
+    successful write per (tool, key) of that slot before it takes calls.
+    Anything else a server held in memory is lost on respawn. health_check()
+    pings every worker and respawns dead or unresponsive ones (also run
+    periodically with health_interval).
+
+    The pool has the MCPClient get_tools / call_tool interface, so
+    MCPTools(pool) can be handed to a ChatAssistant.
+
+    Args:
+        affinity: Function (tool name, arguments) -> routing key or None
+        write_tools: Tools that change server state
+    """
+
+    def __init__(self, command, size=4, timeout=30, health_interval=None,
+                 affinity=city_affinity, write_tools=('set_weather',)):
+        self.command = command
+        self.size = size
+        self.timeout = timeout
+        self.health_interval = health_interval
+        self.affinity = affinity
+        self.write_tools = set(write_tools)
+        self.workers = []
+        self.journals = []
+        self.respawning = set()
+        self.restarts = 0
+        self.lock = threading.Lock()
+        self.changed = threading.Condition(self.lock)
+        self._round_robin = itertools.count()
+        self._tools = None
+        self._stop = threading.Event()
+        self._health_thread = None
+
+    def _spawn(self, slot):
+        return PoolWorker(self.command, self.timeout, slot).start()
+
+    def start(self):
+        """Start all workers; returns the pool"""
+        with ThreadPoolExecutor(max_workers=self.size) as executor:
+            self.workers = list(executor.map(self._spawn, range(self.size)))
+        self.journals = [OrderedDict() for _ in range(self.size)]
+        if self.health_interval:
+            self._health_thread = threading.Thread(target=self._health_loop, daemon=True)
+            self._health_thread.start()
+        return self
+
+    def _health_loop(self):
+        while not self._stop.wait(self.health_interval):
+            self.health_check()
+
+    def slot_for(self, key):
+        """Worker slot of a routing key (stable across runs)"""
+        return zlib.crc32(key.encode('utf-8')) % self.size
+
+    def _acquire(self, key=None):
+        with self.changed:
+            while True:
+                if not self.workers:
+                    raise MCPError("Pool not started")
+                if key is not None:
+                    slot = self.slot_for(key)
+                    if slot not in self.respawning:
+                        worker = self.workers[slot]
+                        break
+                else:
+                    live = [w for w in self.workers if w.slot not in self.respawning]
+                    if live:
+                        # Least loaded first, round-robin among ties
+                        offset = next(self._round_robin) % len(live)
+                        worker = min(live[offset:] + live[:offset], key=lambda w: w.in_flight)
+                        break
+                if not self.changed.wait(self.timeout):
+                    raise MCPError(f"No worker available after {self.timeout}s")
+            worker.in_flight += 1
+            worker.calls += 1
+            return worker
+
+    def _release(self, worker):
+        with self.lock:
+            worker.in_flight -= 1
+
+    def _respawn(self, worker):
+        """Replace a dead worker in the background (no-op if already being replaced)"""
+        with self.lock:
+            slot = worker.slot
+            if slot in self.respawning or slot >= len(self.workers) or self.workers[slot] is not worker:
+                return False
+            self.respawning.add(slot)
+        threading.Thread(target=self._replace, args=(worker,), daemon=True).start()
+        return True
+
+    def _replace(self, worker):
+        worker.close()
+        new_worker = None
+        try:
+            new_worker = self._spawn(worker.slot)
+            # Restore the writes the old process held
+            with self.lock:
+                writes = [(name, arguments) for (name, _), arguments in self.journals[worker.slot].items()]
+            for name, arguments in writes:
+                response = new_worker.client.call_tool(name, arguments)
+                if is_error_response(response):
+                    raise MCPError(f"Replaying {name} failed: {response}")
+        except Exception as e:
+            print(f"Respawn of worker {worker.slot} failed: {e}", file=sys.stderr)
+            if new_worker is not None:
+                new_worker.close()
+            new_worker = None
+
+        with self.changed:
+            if new_worker is not None and not self._stop.is_set():
+                self.workers[worker.slot] = new_worker
+                self.restarts += 1
+                new_worker = None
+            self.respawning.discard(worker.slot)
+            self.changed.notify_all()
+        # Not installed: the spawn failed (the next health check retries) or the pool closed
+        if new_worker is not None:
+            new_worker.close()
+
+    def health_check(self):
+        """Ping every worker and start respawning the dead ones; returns the number respawning"""
+        with self.lock:
+            workers = [w for w in self.workers if w.slot not in self.respawning]
+        dead = [w for w in workers if not w.alive() or not w.ping(timeout=min(5, self.timeout))]
+        return sum(self._respawn(worker) for worker in dead)
+
+    def wait_ready(self, timeout=None):
+        """Wait until no worker is being respawned; returns False on timeout"""
+        with self.changed:
+            return self.changed.wait_for(lambda: not self.respawning, timeout)
+
+    def get_tools(self):
+        """tools/list response (fetched once from a live worker)"""
+        if self._tools is None:
+            worker = self._acquire()
+            try:
+                self._tools = worker.client.get_tools()
+            finally:
+                self._release(worker)
+        return self._tools
+
+    def call_tool(self, name, arguments, timeout=None):
+        """Call a tool on the worker of its affinity key, or the least loaded one"""
+        key = self.affinity(name, arguments)
+        if key is None and name in self.write_tools:
+            raise MCPError(f"Write tool {name} needs an affinity key to keep workers consistent")
+
+        for attempt in range(2):
+            worker = self._acquire(key)
+            try:
+                response = worker.client.call_tool(name, arguments, timeout)
+            except MCPError:
+                if worker.alive() or attempt == 1:
+                    raise
+                # Retried on another worker, or on this slot once it is respawned
+                self._respawn(worker)
+                continue
+            finally:
+                self._release(worker)
+
+            if name in self.write_tools and not is_error_response(response):
+                with self.lock:
+                    journal = self.journals[worker.slot]
+                    journal[(name, key)] = arguments
+                    journal.move_to_end((name, key))
+            return response
+
+    def tools(self):
+        """MCPTools over the pool for a chat assistant session"""
+        return MCPTools(self)
+
+    def stats(self):
+        """Per-worker startup/handshake timing and call counts"""
+        with self.lock:
+            workers = list(self.workers)
+            restarts = self.restarts
+            respawning = len(self.respawning)
+        return {
+            'size': len(workers),
+            'restarts': restarts,
+            'respawning': respawning,
+            'workers': [{
+                'pid': w.pid,
+                'alive': w.alive(),
+                'spawn_ms': w.spawn_time * 1000,
+                'handshake_ms': w.handshake_time * 1000,
+                'calls': w.calls,
+                'in_flight': w.in_flight,
+            } for w in workers],
+        }
+
+    def close(self):
+        self._stop.set()
+        if self._health_thread is not None:
+            self._health_thread.join(timeout=1)
+        with self.changed:
+            workers, self.workers = self.workers, []
+            self.changed.notify_all()
+        for worker in workers:
+            worker.close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+if __name__ == "__main__":
+    start = time.perf_counter()
+    with MCPServerPool([sys.executable, "weather_server.py"], size=4) as pool:
+        print(f"Pool of {pool.size} servers ready in {time.perf_counter() - start:.2f}s")
+        for worker in pool.stats()['workers']:
+            print(f"  pid {worker['pid']}: spawn {worker['spawn_ms']:.1f}ms, "
+                  f"handshake {worker['handshake_ms']:.1f}ms")
+
+        # A short-lived session reuses the warm servers
+        start = time.perf_counter()
+        tools = pool.tools()
+        print("Tools:", [t['function']['name'] for t in tools.get_tools()])
+        print("Berlin weather:", json.dumps(pool.call_tool("get_weather", {"city": "Berlin"})))
+        print(f"Session took {(time.perf_counter() - start) * 1000:.1f}ms")
+
+        # Writes and the reads after them go to the same server
+        pool.call_tool("set_weather", {"city": "Paris", "temp": 25.0})
+        print("Paris weather:", json.dumps(pool.call_tool("get_weather", {"city": " paris"})))
+
+        # Kill that server; the health check replaces it in the background
+        # and replays the write
+        worker = pool.workers[pool.slot_for("paris")]
+        worker.client.process.kill()
+        worker.client.process.wait()
+        print("Respawning:", pool.health_check())
+        pool.wait_ready()
+        print("Paris weather after respawn:", json.dumps(pool.call_tool("get_weather", {"city": "Paris"})))
+        print("Stats:", json.dumps(pool.stats(), indent=2))
@@ -0,0 +1,98 @@
+import json
+from types import SimpleNamespace
+
+from chat_assistant import ChatAssistant, Tools
+from conversation import outline_summary
+
+
+def get_weather(city):
+    # Large, indented JSON like a verbose tool would return
+    return {"city": city, "temp": 20.0, "history": [{"day": d, "temp": 18.5 + d} for d in range(200)]}
+
+
+get_weather_tool = {
+    "type": "function",
+    "name": "get_weather",
+    "description": "Get the current weather temperature for a specified city",
+    "parameters": {
+        "type": "object",
+        "properties": {"city": {"type": "string"}},
+        "required": ["city"],
+        "additionalProperties": False
+    }
+}
+
+
+class FakeResponses:
+    """Calls get_weather once per question, then answers; records request sizes"""
+
+    def __init__(self):
+        self.inputs = []
+
+    def create(self, model, input, tools):
+        self.inputs.append(list(input))
+        last = input[-1]
+        if isinstance(last, dict) and last.get('role') == 'user':
+            call = SimpleNamespace(type="function_call", name="get_weather",
+                                   arguments=json.dumps({"city": last['content']}),
+                                   call_id=f"call-{len(self.inputs)}")
+            return SimpleNamespace(output=[call])
+        text = SimpleNamespace(text="It is 20 degrees. " * 20)
+        return SimpleNamespace(output=[SimpleNamespace(type="message", content=[text])])
+
+
+class FakeInterface:
+    def __init__(self, questions):
+        self.questions = iter(questions)
+
+    def input(self):
+        return next(self.questions)
+
+    def display(self, message):
+        pass
+
+    def display_function_call(self, entry, result):
+        pass
+
+    def display_response(self, entry):
+        pass
+
+
+tools = Tools()
+tools.add_tool(get_weather, get_weather_tool)
+responses = FakeResponses()
+cities = [f"City {i}" for i in range(30)]
+
+assistant = ChatAssistant(
+    tools=tools,
+    developer_prompt="You are a weather assistant.",
+    chat_interface=FakeInterface(cities + ["stop"]),
+    client=SimpleNamespace(responses=responses),
+    context_options={'budget_tokens': 1500, 'max_tool_output_chars': 1000,
+                     'summarizer': outline_summary},
+)
+assistant.run()
+
+context = assistant.context
+print("Context stats:", context.stats())
+print("Requests:", len(responses.inputs))
+print("Largest request:", max(len(request) for request in responses.inputs), "entries")
+
+# Token accounting matches a recount of what is sent
+recount = sum(context.count_tokens(e['content']) for e in context.messages()[:1])
+recount += context.summary_tokens
+recount += sum(tokens for turn in context.turns for _, tokens in turn)
+assert recount == context.total_tokens
+assert context.total_tokens <= 1500 or len(context.turns) == context.keep_turns
+
+# Tool outputs are minified and truncated
+outputs = [e['output'] for e in context.messages()
+           if isinstance(e, dict) and e.get('type') == 'function_call_output']
+assert outputs and all('\n' not in o and len(o) <= 1000 + 40 for o in outputs)
+
+# Older turns were folded into the summary, the last question is still there
+assert context.dropped_turns > 0 and context.summary
+assert context.messages()[-1].type == "message"
+assert any(isinstance(e, dict) and e.get('content') == cities[-1] for e in context.messages())
+print("Summary:", context.summary.split('\n')[-1])
+print("OK")
@@ -0,0 +1,56 @@
+import json
+import threading
+
+from tool_cache import is_error_output, weather_cache
+
+
+weather = {'berlin': 20.0}
+read_started = threading.Event()
+write_done = threading.Event()
+
+
+def get_weather(city, wait=False):
+    temp = weather[city.strip().lower()]
+    if wait:
+        # Hold the old value until the write below has finished
+        read_started.set()
+        write_done.wait(timeout=5)
+    return json.dumps({"result": {"structuredContent": {"result": temp}}})
+
+
+def set_weather(city, temp):
+    weather[city.strip().lower()] = temp
+    return json.dumps({"result": {"structuredContent": {"result": "OK"}}})
+
+
+cache = weather_cache()
+
+# A read that started before a write finishes after it
+results = []
+reader = threading.Thread(target=lambda: results.append(
+    cache.call('get_weather', {'city': 'Berlin'}, lambda: get_weather('Berlin', wait=True))
+))
+reader.start()
+read_started.wait(timeout=5)
+cache.call('set_weather', {'city': 'berlin', 'temp': 25.0}, lambda: set_weather('berlin', 25.0))
+write_done.set()
+reader.join()
+
+# The in-flight read returns the old value but does not store it
+assert json.loads(results[0])['result']['structuredContent']['result'] == 20.0
+fresh = cache.call('get_weather', {'city': 'BERLIN '}, lambda: get_weather('BERLIN '))
+assert json.loads(fresh)['result']['structuredContent']['result'] == 25.0
+
+# Later reads are cached again
+cache.call('get_weather', {'city': 'berlin'}, lambda: get_weather('berlin'))
+print("Stats:", cache.stats())
+assert cache.stats()['get_weather']['hits'] == 1
+
+# Error detection copes with any JSON shape
+assert is_error_output(json.dumps({"error": {"code": -32602}}))
+assert is_error_output(json.dumps({"result": {"isError": True}}))
+assert not is_error_output(json.dumps({"result": 20.0}))
+assert not is_error_output(json.dumps({"result": None}))
+assert not is_error_output(json.dumps([1, 2]))
+assert not is_error_output("not json")
+print("OK")
@@ -0,0 +1,204 @@
+import json
+import threading
+import time
+from collections import OrderedDict
+
+
+def canonical_arguments(arguments):
+    """Arguments as compact JSON with sorted keys, so equal calls get equal keys"""
+    return json.dumps(arguments, sort_keys=True, separators=(',', ':'))
+
+
+def is_error_output(output):
+    """True for function_call outputs holding a JSON-RPC or MCP tool error"""
+    try:
+        response = json.loads(output)
+    except (TypeError, ValueError):
+        return False
+    if not isinstance(response, dict):
+        return False
+    result = response.get('result')
+    return 'error' in response or (isinstance(result, dict) and bool(result.get('isError')))
+
+
+class ToolCache:
+    """
+    Memoize results of read-only tools
+
+    Tools are opted in with cacheable(); results are keyed by tool name and
+    canonical JSON arguments and kept for the tool's TTL. invalidates()
+    declares which entries a write tool makes stale, e.g. set_weather for a
+    city evicts get_weather for the same city. Tools that were not declared
+    cacheable always run. A result computed while a write invalidated its
+    tool is returned but not stored, since it may predate the write.
+
+    Example:
+        cache = (ToolCache()
+                 .cacheable('get_weather', ttl=300, normalize=normalize_city)
+                 .invalidates('set_weather', 'get_weather', fields=['city']))
+    """
+
+    def __init__(self, max_entries=1024, clock=time.monotonic):
+        self.max_entries = max_entries
+        self.clock = clock
+        self.policies = {}
+        self.hooks = {}
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+        self.counts = {}
+        self.generations = {}  # tool name -> number of invalidations
+
+    def cacheable(self, name, ttl=None, normalize=None):
+        """
+        Cache results of a read-only tool
+
+        Args:
+            name: Tool name
+            ttl: Seconds a result stays valid (None for no expiry)
+            normalize: Function mapping arguments to the form used in the key,
+                e.g. lowercasing a city name the server ignores the case of
+        """
+        self.policies[name] = {'ttl': ttl, 'normalize': normalize or (lambda arguments: arguments)}
+        return self
+
+    def invalidates(self, write_tool, read_tool, fields=None):
+        """
+        Evict read_tool entries when write_tool is called
+
+        Args:
+            fields: Arguments that must match between the write call and a
+                cached read call for it to be evicted (None evicts all entries
+                of read_tool)
+        """
+        self.hooks.setdefault(write_tool, []).append((read_tool, fields))
+        return self
+
+    def _count(self, name, counter):
+        counts = self.counts.setdefault(name, {'hits': 0, 'misses': 0, 'invalidations': 0,
+                                               'expirations': 0})
+        counts[counter] += 1
+
+    def call(self, name, arguments, compute, should_cache=None):
+        """
+        Result of a tool call, from the cache when possible
+
+        Args:
+            compute: Function running the tool call on a miss
+            should_cache: Optional predicate on the result; results it rejects
+                (e.g. errors) are returned but not stored
+        """
+        policy = self.policies.get(name)
+        if policy is None:
+            result = compute()
+            self.invalidate_for(name, arguments)
+            return result
+
+        normalized = policy['normalize'](arguments)
+        key = (name, canonical_arguments(normalized))
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None:
+                if policy['ttl'] is not None and self.clock() - entry['created'] > policy['ttl']:
+                    del self.entries[key]
+                    self._count(name, 'expirations')
+                else:
+                    self.entries.move_to_end(key)
+                    self._count(name, 'hits')
+                    return entry['result']
+            self._count(name, 'misses')
+            generation = self.generations.get(name, 0)
+
+        result = compute()
+        if should_cache is None or should_cache(result):
+            with self.lock:
+                if self.generations.get(name, 0) != generation:
+                    # Invalidated while computing; the result may be stale
+                    return result
+                self.entries[key] = {'result': result, 'arguments': normalized,
+                                     'created': self.clock()}
+                self.entries.move_to_end(key)
+                while len(self.entries) > self.max_entries:
+                    self.entries.popitem(last=False)
+        return result
+
+    def invalidate_for(self, write_tool, arguments):
+        """Run the invalidation hooks of a write tool call; returns entries evicted"""
+        evicted = 0
+        for read_tool, fields in self.hooks.get(write_tool, []):
+            match = None
+            if fields is not None:
+                policy = self.policies.get(read_tool)
+                projected = {field: arguments.get(field) for field in fields}
+                match = policy['normalize'](projected) if policy else projected
+            evicted += self.invalidate(read_tool, match)
+        return evicted
+
+    def invalidate(self, name, match=None):
+        """Evict entries of a tool whose arguments contain all items of match"""
+        with self.lock:
+            self.generations[name] = self.generations.get(name, 0) + 1
+            stale = [
+                key for key, entry in self.entries.items()
+                if key[0] == name and (match is None or all(
+                    entry['arguments'].get(field) == value for field, value in match.items()
+                ))
+            ]
+            for key in stale:
+                del self.entries[key]
+                self._count(name, 'invalidations')
+        return len(stale)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+    def stats(self):
+        """Per-tool hits, misses, invalidations, expirations and hit rate"""
+        with self.lock:
+            stats = {name: dict(counts) for name, counts in self.counts.items()}
+        for counts in stats.values():
+            lookups = counts['hits'] + counts['misses']
+            counts['hit_rate'] = counts['hits'] / lookups if lookups else 0.0
+        return stats
+
+
+class CachedTools:
+    """
+    Wrap Tools or MCPTools so function_call goes through a ToolCache
+
+    Only the output is cached; every result carries the call_id of the
+    call it answers. Error outputs are never cached.
+    """
+
+    def __init__(self, tools, cache):
+        self.tools = tools
+        self.cache = cache
+
+    def get_tools(self):
+        return self.tools.get_tools()
+
+    def function_call(self, tool_call_response):
+        arguments = json.loads(tool_call_response.arguments)
+        output = self.cache.call(
+            tool_call_response.name,
+            arguments,
+            lambda: self.tools.function_call(tool_call_response)['output'],
+            should_cache=lambda output: not is_error_output(output),
+        )
+        return {
+            "type": "function_call_output",
+            "call_id": tool_call_response.call_id,
+            "output": output,
+        }
+
+
+def normalize_city(arguments):
+    """weather_server.py strips and lowercases city names"""
+    return {**arguments, 'city': str(arguments.get('city', '')).strip().lower()}
+
+
+def weather_cache(ttl=300):
+    """Cache policy for the weather server tools"""
+    return (ToolCache()
+            .cacheable('get_weather', ttl=ttl, normalize=normalize_city)
+            .invalidates('set_weather', 'get_weather', fields=['city']))
@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+Approximate Nearest Neighbour Index
+IVF (inverted file) cosine search with the fit/search interface of
+minsearch.VectorSearch and one inverted file per keyword-field partition
+"""
+
+import numpy as np
+
+
+def normalize_rows(X):
+    """Unit-length float32 rows (zero rows stay zero)"""
+    X = np.asarray(X, dtype=np.float32)
+    norms = np.linalg.norm(X, axis=1, keepdims=True)
+    norms[norms == 0] = 1
+    return X / norms
+
+
+def kmeans(X, n_clusters, n_iter=10, random_state=1):
+    """
+    Spherical k-means on unit rows
+
+    Returns:
+        tuple: (unit centroids, cluster assignment of each row)
+    """
+    rng = np.random.default_rng(random_state)
+    centroids = X[rng.choice(len(X), n_clusters, replace=False)]
+    for _ in range(n_iter):
+        assignment = np.argmax(X @ centroids.T, axis=1)
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, assignment, X)
+        # Empty clusters keep their previous centroid
+        empty = ~sums.any(axis=1)
+        sums[empty] = centroids[empty]
+        centroids = normalize_rows(sums)
+    assignment = np.argmax(X @ centroids.T, axis=1)
+    return centroids, assignment
+
+
+class Partition:
+    """Vectors sharing one combination of keyword values, grouped into IVF lists"""
+
+    def __init__(self, doc_ids, vectors, n_lists, kmeans_iter, random_state):
+        self.doc_ids = doc_ids
+        self.centroids = None
+        if n_lists > 1:
+            self.centroids, assignment = kmeans(vectors, n_lists, kmeans_iter, random_state)
+            # Store each list contiguously so probing reads slices
+            order = np.argsort(assignment, kind='stable')
+            self.doc_ids = doc_ids[order]
+            vectors = vectors[order]
+            self.starts = np.searchsorted(assignment[order], np.arange(n_lists + 1))
+        self.vectors = vectors
+
+    def search(self, query, n_probe):
+        """(document ids, scores) of the candidates in the n_probe nearest lists"""
+        if self.centroids is None or n_probe >= len(self.centroids):
+            return self.doc_ids, self.vectors @ query
+
+        lists = np.argpartition(-(self.centroids @ query), n_probe - 1)[:n_probe]
+        rows = np.concatenate([np.arange(self.starts[i], self.starts[i + 1]) for i in lists])
+        return self.doc_ids[rows], self.vectors[rows] @ query
+
+
+class IVFIndex:
+    """
+    Approximate cosine search over a 2D array of vectors
+
+    Documents are split by their keyword field values at fit time and each
+    partition gets its own coarse quantizer (k-means over the partition),
+    so a filter such as {'course': ...} only scans the matching partition.
+    Within a partition, a query scores the documents in the n_probe lists
+    whose centroids are closest to it.
+
+    Knobs:
+        n_lists: Lists per partition (default ~sqrt(partition size));
+            more lists means fewer candidates per probe
+        n_probe: Lists scanned per query; higher is slower and closer to exact
+        min_partition_size: Partitions smaller than this are scanned exactly
+    """
+
+    def __init__(self, keyword_fields=None, n_lists=None, n_probe=4,
+                 min_partition_size=256, kmeans_iter=10, random_state=1):
+        self.keyword_fields = list(keyword_fields or [])
+        self.n_lists = n_lists
+        self.n_probe = n_probe
+        self.min_partition_size = min_partition_size
+        self.kmeans_iter = kmeans_iter
+        self.random_state = random_state
+        self.partitions = {}
+        self.docs = []
+
+    def fit(self, vectors, payload):
+        """
+        Fits the index with the provided vectors and payload documents.
+
+        Args:
+            vectors (np.ndarray): 2D array of shape (n_docs, vector_dimension)
+            payload (list of dict): Documents to return from search
+        """
+        if len(vectors) != len(payload):
+            raise ValueError("Number of vectors must match number of payload documents")
+
+        vectors = normalize_rows(vectors)
+        self.docs = payload
+
+        groups = {}
+        for i, doc in enumerate(payload):
+            key = tuple(doc.get(field) for field in self.keyword_fields)
+            groups.setdefault(key, []).append(i)
+
+        self.partitions = {}
+        for key, doc_ids in groups.items():
+            doc_ids = np.array(doc_ids)
+            n_lists = 1
+            if len(doc_ids) >= self.min_partition_size:
+                n_lists = self.n_lists or int(np.sqrt(len(doc_ids)))
+                n_lists = max(1, min(n_lists, len(doc_ids)))
+            self.partitions[key] = Partition(
+                doc_ids, vectors[doc_ids], n_lists, self.kmeans_iter, self.random_state
+            )
+        return self
+
+    def matching_partitions(self, filter_dict):
+        """Partitions whose keyword values satisfy the filter"""
+        unknown = set(filter_dict) - set(self.keyword_fields)
+        if unknown:
+            raise ValueError(f"Cannot filter on non-keyword fields: {sorted(unknown)}")
+
+        allowed = []
+        for field in self.keyword_fields:
+            value = filter_dict.get(field)
+            if value is None:
+                allowed.append(None)
+            elif isinstance(value, (list, tuple, set)):
+                allowed.append(set(value))
+            else:
+                allowed.append({value})
+
+        return [
+            partition for key, partition in self.partitions.items()
+            if all(a is None or v in a for v, a in zip(key, allowed))
+        ]
+
+    def search(self, query_vector, filter_dict=None, num_results=10, output_ids=False,
+               n_probe=None):
+        """
+        Searches the index with the given query vector and keyword filters.
+
+        Args:
+            query_vector (np.ndarray): 1D array of shape (vector_dimension,)
+            filter_dict (dict): Keyword field -> value or list of values
+            num_results (int): Number of top results to return
+            output_ids (bool): If True, adds an '_id' field with the document index
+            n_probe (int): Overrides the index n_probe for this query
+
+        Returns:
+            list of dict: Documents ranked by cosine similarity
+        """
+        partitions = self.matching_partitions(filter_dict or {})
+        if not partitions:
+            return []
+
+        query = normalize_rows(np.asarray(query_vector).reshape(1, -1))[0]
+        n_probe = n_probe or self.n_probe
+
+        candidates = [partition.search(query, n_probe) for partition in partitions]
+        doc_ids = np.concatenate([ids for ids, _ in candidates])
+        scores = np.concatenate([s for _, s in candidates])
+
+        # Like VectorSearch, only positive similarities are returned
+        positive = scores > 0
+        doc_ids, scores = doc_ids[positive], scores[positive]
+        if len(scores) > num_results:
+            top = np.argpartition(-scores, num_results - 1)[:num_results]
+            doc_ids, scores = doc_ids[top], scores[top]
+        top_indices = doc_ids[np.argsort(-scores, kind='stable')]
+
+        if output_ids:
+            return [{**self.docs[i], '_id': int(i)} for i in top_indices]
+        return [self.docs[i] for i in top_indices]
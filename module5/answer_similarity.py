@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Answer Similarity Scoring
+Batched cosine similarity between LLM and original answers
+"""
+
+import numpy as np
+import pandas as pd
+
+
+def normalize_rows(X):
+    """L2-normalize rows, leaving all-zero rows as zeros"""
+    X = np.asarray(X, dtype=np.float64)
+    norms = np.linalg.norm(X, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return X / norms
+
+
+def batch_cosine(pipeline, texts_a, texts_b):
+    """
+    Row-wise cosine similarity between two aligned lists of texts
+
+    Each column is transformed with one pipeline.transform call, so N pairs
+    cost two sparse transforms instead of 2N.
+
+    Args:
+        pipeline: Fitted text -> vector pipeline (e.g. TF-IDF + SVD)
+        texts_a: First texts
+        texts_b: Second texts, aligned with texts_a
+
+    Returns:
+        np.ndarray: One similarity per pair
+    """
+    V_a = normalize_rows(pipeline.transform(list(texts_a)))
+    V_b = normalize_rows(pipeline.transform(list(texts_b)))
+    return np.einsum('ij,ij->i', V_a, V_b)
+
+
+def iter_cosine_csv(path, pipeline, chunksize=10000,
+                    column_a='answer_llm', column_b='answer_orig'):
+    """
+    Stream a results CSV in chunks and yield the similarities of each chunk
+
+    The pipeline must already be fitted (for example on a sample of the
+    file), so only one chunk is held in memory at a time.
+
+    Yields:
+        np.ndarray: Similarities for the rows of one chunk
+    """
+    for chunk in pd.read_csv(path, chunksize=chunksize, usecols=[column_a, column_b]):
+        texts_a = chunk[column_a].fillna('').astype(str)
+        texts_b = chunk[column_b].fillna('').astype(str)
+        yield batch_cosine(pipeline, texts_a, texts_b)
+
+
+def mean_cosine_csv(path, pipeline, chunksize=10000,
+                    column_a='answer_llm', column_b='answer_orig'):
+    """Average similarity over a CSV of any size"""
+    total = 0.0
+    count = 0
+    for scores in iter_cosine_csv(path, pipeline, chunksize, column_a, column_b):
+        total += scores.sum()
+        count += len(scores)
+    return total / count if count else float('nan')
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+ANN Benchmark
+Recall against exact minsearch.VectorSearch and queries/sec of the IVF
+index for a sweep of n_probe values, with course-filtered queries
+"""
+
+import argparse
+import time
+
+import numpy as np
+from minsearch import VectorSearch
+
+from ann_index import IVFIndex
+from metrics import recall_vs_exact
+
+
+def make_corpus(n_docs, dim, n_courses, n_topics=200, seed=1):
+    """Clustered vectors (like SVD document embeddings) with a course per document"""
+    rng = np.random.default_rng(seed)
+    topics = rng.normal(size=(n_topics, dim))
+    topic_of = rng.integers(n_topics, size=n_docs)
+    vectors = topics[topic_of] + 1.5 * rng.normal(size=(n_docs, dim))
+    courses = [f"course-{c}" for c in range(n_courses)]
+    documents = [{'id': str(i), 'course': courses[i % n_courses]} for i in range(n_docs)]
+    return vectors.astype(np.float32), documents
+
+
+def run(search, queries):
+    start = time.perf_counter()
+    results = [search(v, course) for v, course in queries]
+    return results, len(queries) / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--docs", type=int, default=50_000)
+    parser.add_argument("--dim", type=int, default=128)
+    parser.add_argument("--courses", type=int, default=3)
+    parser.add_argument("--queries", type=int, default=500)
+    parser.add_argument("--k", type=int, default=5)
+    args = parser.parse_args()
+
+    vectors, documents = make_corpus(args.docs, args.dim, args.courses)
+    rng = np.random.default_rng(2)
+    picks = rng.choice(len(documents), args.queries, replace=False)
+    queries = [(vectors[i] + 0.3 * rng.normal(size=args.dim).astype(np.float32),
+                documents[i]['course']) for i in picks]
+    print(f"{args.docs} documents x {args.dim} dims, {args.courses} courses, "
+          f"{args.queries} filtered queries, k={args.k}")
+
+    exact_index = VectorSearch(keyword_fields=['course'])
+    exact_index.fit(vectors, documents)
+    exact, exact_qps = run(lambda v, course: exact_index.search(
+        v, filter_dict={'course': course}, num_results=args.k), queries)
+    print(f"VectorSearch (exact)      {exact_qps:8.0f} q/s  recall=1.000")
+
+    start = time.perf_counter()
+    ann_index = IVFIndex(keyword_fields=['course'])
+    ann_index.fit(vectors, documents)
+    print(f"IVF fit: {time.perf_counter() - start:.2f}s")
+
+    for n_probe in [1, 2, 4, 8, 16, 32]:
+        results, qps = run(lambda v, course: ann_index.search(
+            v, filter_dict={'course': course}, num_results=args.k, n_probe=n_probe), queries)
+        recall = recall_vs_exact(results, exact)
+        print(f"IVF n_probe={n_probe:<3}          {qps:8.0f} q/s  recall={recall:.3f}"
+              f"  {qps / exact_qps:5.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Qdrant Loading Benchmark
+Compares a single in-memory upsert with the streaming loader
+against in-memory and local-path Qdrant
+"""
+
+import argparse
+import resource
+import tempfile
+import time
+
+import numpy as np
+from qdrant_client import QdrantClient
+from qdrant_client.http import models
+
+from qdrant_loader import StreamingLoader
+
+
+COLLECTION_NAME = "bench_load"
+
+
+def generate_points(n, dim, seed=1):
+    """Yield (id, vector, payload) tuples without materializing the corpus"""
+    rng = np.random.default_rng(seed)
+    courses = ["data-engineering-zoomcamp", "machine-learning-zoomcamp", "mlops-zoomcamp"]
+    for i in range(n):
+        yield i, rng.standard_normal(dim).astype(np.float32), {
+            "id": f"doc-{i}",
+            "course": courses[i % len(courses)],
+        }
+
+
+def recreate(client, dim):
+    if client.collection_exists(COLLECTION_NAME):
+        client.delete_collection(COLLECTION_NAME)
+    client.create_collection(
+        collection_name=COLLECTION_NAME,
+        vectors_config=models.VectorParams(size=dim, distance=models.Distance.COSINE),
+    )
+
+
+def upsert_all_at_once(client, n, dim):
+    points = [
+        models.PointStruct(id=i, vector=vector.tolist(), payload=payload)
+        for i, vector, payload in generate_points(n, dim)
+    ]
+    client.upsert(collection_name=COLLECTION_NAME, points=points)
+
+
+def upsert_streaming(client, n, dim, batch_size, writers):
+    loader = StreamingLoader(client, COLLECTION_NAME, batch_size=batch_size, writers=writers)
+    loader.load(generate_points(n, dim))
+
+
+def timed(label, func, n):
+    start = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start
+    peak_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(f"  {label:<28} {elapsed:8.2f}s  {n / elapsed:10.0f} points/sec  peak RSS {peak_mb:.0f} MB")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--points", type=int, default=20000)
+    parser.add_argument("--dim", type=int, default=128)
+    parser.add_argument("--batch-size", type=int, default=256)
+    parser.add_argument("--writers", type=int, default=4)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as path:
+        for label, client in [(":memory:", QdrantClient(":memory:")),
+                              ("local path", QdrantClient(path=path))]:
+            print(f"Qdrant {label}, {args.points} points of dim {args.dim}")
+            # Streaming runs first so its peak RSS is not hidden by the full upsert
+            recreate(client, args.dim)
+            timed(f"streaming x{args.writers} (batch={args.batch_size})",
+                  lambda: upsert_streaming(client, args.points, args.dim,
+                                           args.batch_size, args.writers),
+                  args.points)
+            recreate(client, args.dim)
+            timed("single upsert", lambda: upsert_all_at_once(client, args.points, args.dim),
+                  args.points)
+            client.close()
+
+
+if __name__ == "__main__":
+    main()
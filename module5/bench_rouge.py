@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+ROUGE Benchmark
+Compares the `rouge` package row by row with the fast scorer on a
+results-gpt4o-mini.csv sized input
+"""
+
+import argparse
+import os
+import random
+import time
+
+import numpy as np
+import pandas as pd
+from rouge import Rouge
+
+from rouge_scorer import METRICS, score_all
+
+
+RESULTS_URL = ('https://raw.githubusercontent.com/DataTalksClub/llm-zoomcamp/main/'
+               '03-evaluation/rag_evaluation/data/results-gpt4o-mini.csv')
+
+
+def make_results(n_rows, seed=1):
+    """Synthetic answer pairs with the length profile of the course results file"""
+    rng = random.Random(seed)
+    vocab = [f"word{i}" for i in range(3000)]
+    rows = []
+    for i in range(n_rows):
+        orig = ". ".join(" ".join(rng.choices(vocab, k=rng.randint(8, 20)))
+                         for _ in range(rng.randint(1, 5)))
+        words = orig.split()
+        llm = " ".join(rng.choice(words) if rng.random() < 0.6 else rng.choice(vocab)
+                       for _ in range(rng.randint(20, 80)))
+        rows.append({'answer_llm': llm, 'answer_orig': orig})
+    return pd.DataFrame(rows)
+
+
+def rouge_package(df):
+    rouge = Rouge()
+    scores = []
+    for _, row in df.iterrows():
+        try:
+            s = rouge.get_scores(row.answer_llm, row.answer_orig)[0]
+            scores.append([s[metric]['f'] for metric in METRICS])
+        except Exception:
+            scores.append([np.nan] * len(METRICS))
+    return np.array(scores)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=1830)
+    parser.add_argument("--csv", default=None,
+                        help="Results CSV (path or URL, e.g. %s)" % RESULTS_URL)
+    parser.add_argument("--workers", type=int, default=max(2, os.cpu_count() or 1),
+                        help="Process pool size compared with a single process")
+    args = parser.parse_args()
+
+    df = pd.read_csv(args.csv) if args.csv else make_results(args.rows)
+    print(f"Scoring {len(df)} answer pairs")
+
+    start = time.perf_counter()
+    reference = rouge_package(df)
+    elapsed_package = time.perf_counter() - start
+    print(f"rouge package            {elapsed_package:8.2f}s  {len(df) / elapsed_package:8.0f} pairs/sec")
+
+    for workers in sorted({1, args.workers}):
+        start = time.perf_counter()
+        result = score_all(df.answer_llm, df.answer_orig, workers=workers)
+        elapsed = time.perf_counter() - start
+        print(f"fast scorer (workers={workers})  {elapsed:8.2f}s  {len(df) / elapsed:8.0f} pairs/sec"
+              f"  {elapsed_package / elapsed:5.1f}x")
+
+    for m, metric in enumerate(METRICS):
+        diff = np.nanmax(np.abs(result.values(metric, 'f') - reference[:, m]))
+        print(f"max |{metric} f difference| vs rouge package: {diff:.2e}")
+    print(f"failed rows: {len(result.failures)}")
+    for row, reason in result.failures[:5]:
+        print(f"  row {row}: {reason}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Parallel Evaluation Runner
+Runs search functions over the ground truth on a thread pool, a process pool
+or asyncio, and reports quality together with per-query latency
+"""
+
+import asyncio
+import inspect
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+
+import numpy as np
+
+from metrics import hit_rate, mrr, recall_vs_exact, relevance_from_results
+
+
+def timed_search(search_function, query):
+    """Run one search and return (results, latency in seconds)"""
+    start = time.perf_counter()
+    results = search_function(query)
+    return results, time.perf_counter() - start
+
+
+_worker_search_function = None
+
+
+def _timed_worker_search(query):
+    return timed_search(_worker_search_function, query)
+
+
+async def timed_search_async(search_function, query, semaphore):
+    async with semaphore:
+        start = time.perf_counter()
+        if inspect.iscoroutinefunction(search_function):
+            results = await search_function(query)
+        else:
+            results = await asyncio.to_thread(search_function, query)
+        return results, time.perf_counter() - start
+
+
+def latency_percentiles(latencies):
+    """p50/p95/p99 latency in milliseconds"""
+    latencies_ms = np.asarray(latencies) * 1000
+    p50, p95, p99 = np.percentile(latencies_ms, [50, 95, 99])
+    return {'p50_ms': p50, 'p95_ms': p95, 'p99_ms': p99}
+
+
+class EvaluationRunner:
+    """
+    Evaluate search functions concurrently
+
+    Executors:
+        'serial': one query at a time (the original evaluate loop)
+        'thread': thread pool, for backends that release the GIL or do I/O
+        'process': process pool, for CPU-bound pure Python search; on
+            platforms with fork the workers inherit the search function
+            (closures work), elsewhere it must be picklable
+        'asyncio': event loop with at most `workers` queries in flight;
+            coroutine functions are awaited, plain functions run in threads
+    """
+
+    EXECUTORS = ('serial', 'thread', 'process', 'asyncio')
+
+    def __init__(self, executor='thread', workers=None):
+        if executor not in self.EXECUTORS:
+            raise ValueError(f"Unknown executor {executor!r}, expected one of {self.EXECUTORS}")
+        self.executor = executor
+        self.workers = workers or os.cpu_count() or 1
+
+    def run(self, ground_truth, search_function):
+        """
+        Run search_function on every query
+
+        Returns:
+            list: (results, latency) tuples in query order
+        """
+        if self.executor == 'serial':
+            return [timed_search(search_function, q) for q in ground_truth]
+
+        if self.executor == 'thread':
+            with ThreadPoolExecutor(max_workers=self.workers) as executor:
+                return list(executor.map(partial(timed_search, search_function), ground_truth))
+
+        if self.executor == 'process':
+            return self._run_processes(ground_truth, search_function)
+
+        async def run_all():
+            semaphore = asyncio.Semaphore(self.workers)
+            return await asyncio.gather(*[
+                timed_search_async(search_function, q, semaphore) for q in ground_truth
+            ])
+        return asyncio.run(run_all())
+
+    def _run_processes(self, ground_truth, search_function):
+        global _worker_search_function
+        chunksize = max(1, len(ground_truth) // (self.workers * 4))
+
+        if 'fork' in multiprocessing.get_all_start_methods():
+            # Forked workers inherit the function, so it is never pickled
+            _worker_search_function = search_function
+            context = multiprocessing.get_context('fork')
+            try:
+                with ProcessPoolExecutor(max_workers=self.workers, mp_context=context) as executor:
+                    return list(executor.map(_timed_worker_search, ground_truth,
+                                             chunksize=chunksize))
+            finally:
+                _worker_search_function = None
+
+        with ProcessPoolExecutor(max_workers=self.workers) as executor:
+            return list(executor.map(partial(timed_search, search_function), ground_truth,
+                                     chunksize=chunksize))
+
+    def evaluate(self, ground_truth, search_function, exact_results=None, keep_results=False):
+        """
+        Evaluate search function using ground truth data
+
+        Args:
+            exact_results: Results of exact search for the same queries; when
+                given, recall_vs_exact is reported for approximate searches
+            keep_results: Also return the per-query results under 'results'
+
+        Returns:
+            dict: hit_rate, mrr, latency percentiles, queries/sec and wall time
+        """
+        start = time.perf_counter()
+        timed_results = self.run(ground_truth, search_function)
+        wall_time = time.perf_counter() - start
+
+        all_results = [results for results, _ in timed_results]
+        latencies = [latency for _, latency in timed_results]
+        k = max((len(results) for results in all_results), default=0)
+        relevance = relevance_from_results(ground_truth, all_results, k)
+
+        metrics = {
+            'hit_rate': hit_rate(relevance),
+            'mrr': mrr(relevance),
+            'queries_per_sec': len(ground_truth) / wall_time,
+            'wall_time': wall_time,
+        }
+        metrics.update(latency_percentiles(latencies))
+        if exact_results is not None:
+            metrics['recall_vs_exact'] = recall_vs_exact(all_results, exact_results)
+        if keep_results:
+            metrics['results'] = all_results
+        return metrics
+
+
+def format_metrics(metrics):
+    """One-line summary of quality and latency"""
+    line = (f"hit_rate={metrics['hit_rate']:.3f} mrr={metrics['mrr']:.3f} "
+            f"p50={metrics['p50_ms']:.2f}ms p95={metrics['p95_ms']:.2f}ms "
+            f"p99={metrics['p99_ms']:.2f}ms {metrics['queries_per_sec']:.0f} q/s")
+    if 'recall_vs_exact' in metrics:
+        line += f" recall_vs_exact={metrics['recall_vs_exact']:.3f}"
+    return line
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Hybrid Search
+Runs text and vector retrievers concurrently for one query and fuses their
+ranked lists with reciprocal rank fusion (RRF) or weighted rank scores
+"""
+
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+
+# Guards lazy pool creation; a lock held by another thread at fork time
+# would stay locked in the child, so children start with a fresh one
+_executor_lock = threading.Lock()
+
+
+def _reset_executor_lock():
+    global _executor_lock
+    _executor_lock = threading.Lock()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_executor_lock)
+
+
+def reciprocal_rank_fusion(result_lists, weights=None, k=60, key='id'):
+    """
+    Fuse ranked lists by sum of weight / (k + rank)
+
+    Args:
+        result_lists: Ranked lists of documents, one per retriever
+        weights: Weight per retriever (default all 1)
+        k: RRF constant; larger values flatten the rank curve
+        key: Document field identifying the same document across lists
+
+    Returns:
+        list: Documents ordered by fused score (first occurrence kept)
+    """
+    weights = weights or [1] * len(result_lists)
+    scores = {}
+    docs = {}
+    for weight, results in zip(weights, result_lists):
+        for rank, doc in enumerate(results, start=1):
+            doc_id = doc[key]
+            scores[doc_id] = scores.get(doc_id, 0.0) + weight / (k + rank)
+            docs.setdefault(doc_id, doc)
+    ranked = sorted(scores, key=scores.get, reverse=True)
+    return [docs[doc_id] for doc_id in ranked]
+
+
+def weighted_rank_fusion(result_lists, weights=None, key='id'):
+    """
+    Fuse ranked lists by weighted linear rank scores
+
+    The retrievers do not expose comparable similarity scores, so each
+    result gets 1 - (rank - 1) / len(results) (1 for the top hit) in its
+    list and the scores are combined with the retriever weights.
+    """
+    weights = weights or [1] * len(result_lists)
+    scores = {}
+    docs = {}
+    for weight, results in zip(weights, result_lists):
+        n = len(results)
+        for rank, doc in enumerate(results):
+            doc_id = doc[key]
+            scores[doc_id] = scores.get(doc_id, 0.0) + weight * (1 - rank / n)
+            docs.setdefault(doc_id, doc)
+    ranked = sorted(scores, key=scores.get, reverse=True)
+    return [docs[doc_id] for doc_id in ranked]
+
+
+class HybridRetriever:
+    """
+    Combine several retrievers into one search function
+
+    Each retriever is called as retriever(query, num_results) and returns a
+    ranked list of documents; the retrievers keep using their own fitted
+    indexes and pipelines. For every query they run at the same time on a
+    thread pool, then the lists are fused and cut to num_results.
+
+    All callers share one pool of max_workers threads (default: one per
+    retriever), so concurrent searches from several threads queue behind
+    each other; with an N-thread evaluation runner pass
+    max_workers=N * len(retrievers) to let them overlap.
+
+    Example:
+        hybrid = HybridRetriever([text_search, vector_search], fusion='rrf')
+        runner.evaluate(ground_truth, lambda q: hybrid.search(q, num_results=5))
+    """
+
+    FUSIONS = ('rrf', 'weighted')
+
+    def __init__(self, retrievers, fusion='rrf', weights=None, num_candidates=20,
+                 rrf_k=60, key='id', max_workers=None):
+        if fusion not in self.FUSIONS:
+            raise ValueError(f"Unknown fusion {fusion!r}, expected one of {self.FUSIONS}")
+        self.retrievers = list(retrievers)
+        self.fusion = fusion
+        self.weights = weights
+        self.num_candidates = num_candidates
+        self.rrf_k = rrf_k
+        self.key = key
+        self.max_workers = max_workers or len(self.retrievers)
+        self._executor = None
+        self._pid = None
+
+    def executor(self):
+        # Threads do not survive fork, so forked evaluation workers get their own pool
+        with _executor_lock:
+            if self._executor is None or self._pid != os.getpid():
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers)
+                self._pid = os.getpid()
+            return self._executor
+
+    def candidates(self, query):
+        """Ranked candidate lists, one per retriever"""
+        executor = self.executor()
+        futures = [executor.submit(retriever, query, self.num_candidates)
+                   for retriever in self.retrievers]
+        return [future.result() for future in futures]
+
+    def search(self, query, num_results=5):
+        result_lists = self.candidates(query)
+        if self.fusion == 'rrf':
+            fused = reciprocal_rank_fusion(result_lists, self.weights, self.rrf_k, self.key)
+        else:
+            fused = weighted_rank_fusion(result_lists, self.weights, self.key)
+        return fused[:num_results]
+
+    def close(self):
+        with _executor_lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown()
@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+Retrieval Metrics
+Vectorized hit rate, MRR, recall, precision and nDCG over a relevance matrix
+"""
+
+import numpy as np
+
+
+def relevance_matrix(relevance_total, k=None):
+    """
+    Pack per-query relevance lists into a (queries x k) uint8 matrix
+
+    Shorter lists are padded with zeros; a matrix input is returned as is.
+
+    Args:
+        relevance_total: List of lists of booleans, or a 2D array
+        k: Number of columns (defaults to the longest list)
+    """
+    if isinstance(relevance_total, np.ndarray):
+        return relevance_total.astype(np.uint8, copy=False)
+
+    if k is None:
+        k = max((len(line) for line in relevance_total), default=0)
+    matrix = np.zeros((len(relevance_total), k), dtype=np.uint8)
+    for i, line in enumerate(relevance_total):
+        line = line[:k]
+        matrix[i, :len(line)] = line
+    return matrix
+
+
+def relevance_from_results(ground_truth, results, k):
+    """Relevance matrix from search results ({'id': ...} dicts) and ground truth rows"""
+    matrix = np.zeros((len(ground_truth), k), dtype=np.uint8)
+    for i, (q, docs) in enumerate(zip(ground_truth, results)):
+        doc_id = q['document']
+        for rank, d in enumerate(docs[:k]):
+            if d['id'] == doc_id:
+                matrix[i, rank] = 1
+    return matrix
+
+
+def recall_vs_exact(results, exact_results):
+    """
+    Mean fraction of the exact top-k ids that an approximate search also returned
+
+    Args:
+        results: Per-query result lists ({'id': ...} dicts) from the approximate search
+        exact_results: Per-query result lists from exact search over the same queries
+    """
+    recalls = []
+    for docs, exact_docs in zip(results, exact_results):
+        if not exact_docs:
+            continue
+        found = {d['id'] for d in docs}
+        recalls.append(sum(d['id'] in found for d in exact_docs) / len(exact_docs))
+    return float(np.mean(recalls)) if recalls else 1.0
+
+
+def hit_rate(relevance_total):
+    """Calculate hit rate metric"""
+    rel = relevance_matrix(relevance_total)
+    return float(rel.any(axis=1).mean())
+
+
+def mrr(relevance_total):
+    """Calculate Mean Reciprocal Rank metric"""
+    rel = relevance_matrix(relevance_total)
+    return float(reciprocal_ranks(rel).mean())
+
+
+def reciprocal_ranks(rel):
+    """1 / rank of the first relevant result per query (0 when there is none)"""
+    if rel.shape[1] == 0:
+        return np.zeros(rel.shape[0])
+    first = rel.argmax(axis=1)
+    found = rel[np.arange(len(rel)), first] > 0
+    return np.where(found, 1.0 / (first + 1), 0.0)
+
+
+def per_query_metrics(relevance_total, n_relevant=1):
+    """
+    Per-query metric values for every cutoff k = 1..K at once
+
+    Args:
+        relevance_total: Relevance lists or matrix (queries x K)
+        n_relevant: Relevant documents per query (scalar or array); the
+            ground truth here has exactly one
+
+    Returns:
+        dict: metric name -> float array of shape (queries, K), column j
+            holding the value at k = j + 1 (K = 1 when all lists are empty)
+    """
+    rel = relevance_matrix(relevance_total).astype(np.float64)
+    if rel.shape[1] == 0:
+        # No query returned results: every metric is zero at k = 1
+        rel = np.zeros((rel.shape[0], 1))
+    n_queries, max_k = rel.shape
+    ks = np.arange(1, max_k + 1)
+    n_relevant = np.broadcast_to(np.asarray(n_relevant, dtype=np.float64), (n_queries,))
+
+    hits_cum = np.cumsum(rel, axis=1)
+
+    # rank of the first relevant result (max_k when there is none)
+    has_hit = hits_cum[:, -1] > 0
+    first = np.where(has_hit, rel.argmax(axis=1), max_k)
+    rr_at_k = np.where(first[:, None] < ks[None, :], 1.0 / (first[:, None] + 1), 0.0)
+
+    discounts = 1.0 / np.log2(ks + 1)
+    dcg = np.cumsum(rel * discounts, axis=1)
+    ideal_hits = np.minimum(n_relevant[:, None], ks[None, :])
+    idcg = np.cumsum(discounts)[np.maximum(ideal_hits.astype(int) - 1, 0)]
+    idcg = np.where(ideal_hits > 0, idcg, 1.0)
+
+    return {
+        'hit_rate': (hits_cum > 0).astype(np.float64),
+        'mrr': rr_at_k,
+        'recall': hits_cum / np.maximum(n_relevant[:, None], 1),
+        'precision': hits_cum / ks,
+        'ndcg': dcg / idcg,
+    }
+
+
+def compute_metrics(relevance_total, n_relevant=1):
+    """
+    Mean of each metric at every cutoff
+
+    Returns:
+        dict: metric name -> {k: value} for k = 1..K
+    """
+    per_query = per_query_metrics(relevance_total, n_relevant)
+    return {
+        name: {k + 1: float(v) for k, v in enumerate(values.mean(axis=0))}
+        for name, values in per_query.items()
+    }
+
+
+def bootstrap_ci(values, n_boot=1000, alpha=0.05, seed=1):
+    """
+    Percentile bootstrap confidence interval for the mean of per-query values
+
+    Each replicate resamples whole rows, so all cutoffs of a 2D input share
+    the same resample and memory stays at one copy of the values.
+
+    Args:
+        values: Per-query values, shape (queries,) or (queries, K)
+        n_boot: Number of bootstrap replicates
+        alpha: 1 - confidence level
+        seed: Random seed
+
+    Returns:
+        tuple: (low, high), floats for 1D input or arrays of length K
+    """
+    values = np.asarray(values, dtype=np.float64)
+    n = len(values)
+    rng = np.random.default_rng(seed)
+
+    means = np.empty((n_boot,) + values.shape[1:])
+    for b in range(n_boot):
+        means[b] = values[rng.integers(0, n, n)].mean(axis=0)
+
+    low, high = np.percentile(means, [100 * alpha / 2, 100 * (1 - alpha / 2)], axis=0)
+    if values.ndim == 1:
+        return float(low), float(high)
+    return low, high
+
+
+def metrics_with_ci(relevance_total, n_relevant=1, n_boot=1000, alpha=0.05, seed=1):
+    """
+    Mean and bootstrap confidence interval of each metric at every cutoff
+
+    Returns:
+        dict: metric name -> {k: (mean, low, high)}
+    """
+    result = {}
+    for name, values in per_query_metrics(relevance_total, n_relevant).items():
+        low, high = bootstrap_ci(values, n_boot=n_boot, alpha=alpha, seed=seed)
+        means = values.mean(axis=0)
+        result[name] = {
+            k + 1: (float(means[k]), float(low[k]), float(high[k]))
+            for k in range(values.shape[1])
+        }
+    return result
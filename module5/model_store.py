@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Fitted Model Store
+Caches fitted TF-IDF + SVD pipelines on disk, keyed by field recipe,
+vectorizer parameters and a fingerprint of the corpus
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+
+import numpy as np
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.decomposition import TruncatedSVD
+from sklearn.pipeline import make_pipeline
+
+
+def corpus_fingerprint(texts):
+    """Hash of the texts in order"""
+    h = hashlib.sha1()
+    for text in texts:
+        data = text.encode('utf-8')
+        h.update(len(data).to_bytes(8, 'little'))
+        h.update(data)
+    return h.hexdigest()
+
+
+def store_key(recipe, tfidf_params, svd_params, fingerprint):
+    """Directory name for one fitted pipeline"""
+    spec = json.dumps({
+        'recipe': recipe,
+        'tfidf': tfidf_params,
+        'svd': svd_params,
+        'corpus': fingerprint,
+    }, sort_keys=True)
+    return hashlib.sha1(spec.encode('utf-8')).hexdigest()
+
+
+def fitted_tfidf(vocabulary, idf, **tfidf_params):
+    """
+    TfidfVectorizer with a known vocabulary and idf, ready to transform
+
+    Args:
+        vocabulary: Term -> column index
+        idf: Inverse document frequencies in column order
+        tfidf_params: Tokenization and weighting parameters of the vectorizer
+    """
+    vectorizer = TfidfVectorizer(**tfidf_params)
+    vectorizer.vocabulary_ = vocabulary
+    vectorizer.fixed_vocabulary_ = False
+    vectorizer.idf_ = idf
+    return vectorizer
+
+
+def save_pipeline(path, pipeline, X, meta):
+    """Write vocabulary, idf, SVD components and the document matrix to a directory"""
+    vectorizer, svd = pipeline[0], pipeline[1]
+    tmp_path = tempfile.mkdtemp(dir=os.path.dirname(path) or '.')
+    try:
+        with open(os.path.join(tmp_path, 'vocabulary.json'), 'w') as f:
+            json.dump({term: int(i) for term, i in vectorizer.vocabulary_.items()}, f)
+        np.save(os.path.join(tmp_path, 'idf.npy'), vectorizer.idf_)
+        np.save(os.path.join(tmp_path, 'components.npy'), svd.components_)
+        np.save(os.path.join(tmp_path, 'X.npy'), np.ascontiguousarray(X))
+        with open(os.path.join(tmp_path, 'meta.json'), 'w') as f:
+            json.dump(meta, f)
+        # Publish the directory atomically so readers never see a partial entry
+        os.replace(tmp_path, path)
+    except BaseException:
+        # Don't leave the partial copy behind (e.g. another process stored it first)
+        shutil.rmtree(tmp_path, ignore_errors=True)
+        raise
+
+
+def load_pipeline(path, tfidf_params, svd_params):
+    """
+    Rebuild a fitted pipeline from a store directory without refitting
+
+    Returns:
+        tuple: (pipeline, document matrix as a read-only memmap)
+    """
+    with open(os.path.join(path, 'vocabulary.json')) as f:
+        vocabulary = json.load(f)
+
+    vectorizer = fitted_tfidf(vocabulary, np.load(os.path.join(path, 'idf.npy')), **tfidf_params)
+
+    svd = TruncatedSVD(**svd_params)
+    svd.components_ = np.load(os.path.join(path, 'components.npy'))
+    svd.n_features_in_ = svd.components_.shape[1]
+
+    X = np.load(os.path.join(path, 'X.npy'), mmap_mode='r')
+    return make_pipeline(vectorizer, svd), X
+
+
+def fit_or_load(texts, recipe, tfidf_params=None, svd_params=None, store_dir='model_store',
+                fit=None, refit=False):
+    """
+    Fitted TF-IDF + SVD pipeline and transformed documents for a corpus
+
+    The first call fits and stores the pipeline; later calls with the same
+    recipe, parameters and texts load it from store_dir instead.
+
+    Args:
+        texts: Documents to fit on (in order)
+        recipe: Name of the field combination the texts were built from,
+            e.g. 'question' or 'question+text'
+        tfidf_params: TfidfVectorizer parameters (default min_df=3)
+        svd_params: TruncatedSVD parameters (default 128 components, random_state=1)
+        store_dir: Directory holding the stored pipelines
+        fit: Optional callable returning a fitted (pipeline, matrix) for the
+            same texts and parameters, used on a miss instead of fitting
+            from the texts (e.g. multifield.FieldCounts.fit_pipeline)
+        refit: Fit even if the store has an entry, and replace that entry
+
+    Returns:
+        tuple: (pipeline, document matrix)
+    """
+    texts = list(texts)
+    tfidf_params = tfidf_params if tfidf_params is not None else {'min_df': 3}
+    svd_params = svd_params if svd_params is not None else {'n_components': 128, 'random_state': 1}
+
+    fingerprint = corpus_fingerprint(texts)
+    key = store_key(recipe, tfidf_params, svd_params, fingerprint)
+    path = os.path.join(store_dir, key)
+
+    if os.path.exists(path):
+        if not refit:
+            return load_pipeline(path, tfidf_params, svd_params)
+        shutil.rmtree(path, ignore_errors=True)
+
+    if fit is not None:
+        pipeline, X = fit()
+    else:
+        pipeline = make_pipeline(
+            TfidfVectorizer(**tfidf_params),
+            TruncatedSVD(**svd_params)
+        )
+        X = pipeline.fit_transform(texts)
+
+    os.makedirs(store_dir, exist_ok=True)
+    meta = {
+        'recipe': recipe,
+        'tfidf': tfidf_params,
+        'svd': svd_params,
+        'corpus': fingerprint,
+        'n_documents': len(texts),
+    }
+    try:
+        save_pipeline(path, pipeline, X, meta)
+    except OSError:
+        # Another process stored the same entry first
+        pass
+    return pipeline, X
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Multi-field Vectorization
+Tokenizes each document field once and builds TF-IDF + SVD pipelines for
+any field combination by adding per-field term-count matrices
+"""
+
+import numpy as np
+from sklearn.feature_extraction.text import CountVectorizer, TfidfTransformer
+from sklearn.decomposition import TruncatedSVD
+from sklearn.pipeline import make_pipeline
+
+from model_store import fitted_tfidf
+
+
+# CountVectorizer options that only change how a string is split into terms.
+# Document frequency limits depend on the field combination, so they are
+# arguments of fit_pipeline instead. Word and character n-grams would span
+# the boundary between fields in the joined text, so ngram_range and
+# analyzer are only accepted at their unigram word defaults.
+TOKENIZE_PARAMS = {
+    'input', 'encoding', 'decode_error', 'strip_accents', 'lowercase', 'preprocessor',
+    'tokenizer', 'stop_words', 'token_pattern', 'ngram_range', 'analyzer',
+}
+
+
+class FieldCounts:
+    """
+    Per-field sparse term-count matrices over one shared vocabulary
+
+    Counts are computed on first use with a single CountVectorizer pass over
+    every field string, so each field is tokenized exactly once. Counts of
+    a field combination equal the counts of the fields' texts joined with
+    spaces, so combine({'question': 1, 'text': 1}) matches tokenizing
+    question + ' ' + text, while other weights act as field boosts.
+
+    count_params are the unigram tokenization options of CountVectorizer
+    (e.g. stop_words, token_pattern); anything else raises ValueError.
+    """
+
+    def __init__(self, documents, fields, **count_params):
+        if (tuple(count_params.get('ngram_range', (1, 1))) != (1, 1)
+                or count_params.get('analyzer', 'word') != 'word'):
+            raise ValueError("FieldCounts supports unigram word analysis only: "
+                             "n-grams would span the boundary between fields")
+        unsupported = sorted(set(count_params) - TOKENIZE_PARAMS)
+        if unsupported:
+            raise ValueError(f"Unsupported FieldCounts options: {unsupported} "
+                             "(pass min_df / max_df to fit_pipeline)")
+        self.documents = documents
+        self.fields = list(fields)
+        self.count_params = count_params
+        self.vectorizer = None
+        self.counts = None
+
+    def fit(self):
+        if self.counts is not None:
+            return self
+        n_docs = len(self.documents)
+        texts = [doc[field] or '' for field in self.fields for doc in self.documents]
+
+        self.vectorizer = CountVectorizer(**self.count_params)
+        all_counts = self.vectorizer.fit_transform(texts).tocsr()
+
+        self.counts = {
+            field: all_counts[i * n_docs:(i + 1) * n_docs]
+            for i, field in enumerate(self.fields)
+        }
+        return self
+
+    def combine(self, weights):
+        """
+        Weighted sum of per-field count matrices
+
+        Args:
+            weights: Field name -> weight, e.g. {'question': 2, 'text': 1}
+
+        Returns:
+            scipy.sparse.csr_matrix: (documents x vocabulary) counts
+        """
+        self.fit()
+        combined = None
+        for field, weight in weights.items():
+            term = self.counts[field] * weight if weight != 1 else self.counts[field]
+            combined = term if combined is None else combined + term
+        return combined.tocsr()
+
+    def fit_pipeline(self, weights, min_df=3, max_df=1.0, n_components=128, random_state=1,
+                     **tfidf_params):
+        """
+        Fit TF-IDF + SVD on a field combination without re-tokenizing
+
+        For unit weights the result is the same as
+        make_pipeline(TfidfVectorizer(min_df=min_df, max_df=max_df, **tfidf_params),
+        TruncatedSVD(...)) fitted on the joined field texts.
+
+        Args:
+            min_df, max_df: Document frequency limits, as in TfidfVectorizer
+            tfidf_params: TfidfTransformer options (norm, smooth_idf,
+                sublinear_tf); use_idf=False is not supported
+
+        Returns:
+            tuple: (pipeline that transforms raw query text, document matrix)
+        """
+        # The query vectorizer is rebuilt from idf_, which use_idf=False doesn't have
+        if not tfidf_params.get('use_idf', True):
+            raise ValueError("fit_pipeline needs use_idf=True")
+        tfidf = TfidfTransformer(**tfidf_params)
+        counts = self.combine(weights)
+
+        # Keep terms within the document frequency limits, as TfidfVectorizer does
+        n_docs = counts.shape[0]
+        df = np.bincount(counts.indices, minlength=counts.shape[1])
+        min_count = min_df if isinstance(min_df, int) else min_df * n_docs
+        max_count = max_df if isinstance(max_df, int) else max_df * n_docs
+        if max_count < min_count:
+            raise ValueError("max_df corresponds to < documents than min_df")
+        keep = np.flatnonzero((df >= min_count) & (df <= max_count))
+        if len(keep) == 0:
+            raise ValueError("After pruning, no terms remain. Try a lower min_df or a higher max_df.")
+        counts = counts[:, keep]
+
+        X_tfidf = tfidf.fit_transform(counts)
+        svd = TruncatedSVD(n_components=n_components, random_state=random_state)
+        X = svd.fit_transform(X_tfidf)
+
+        # Fitted vectorizer over the kept terms, so queries use the normal text path
+        terms = self.vectorizer.get_feature_names_out()[keep]
+        vectorizer = fitted_tfidf({term: i for i, term in enumerate(terms)}, tfidf.idf_,
+                                  **self.count_params, **tfidf_params)
+        return make_pipeline(vectorizer, svd), X
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Partitioned Index
+One vector sub-index per value of a keyword field (e.g. course), so
+filtered queries only score the documents of their partition
+"""
+
+import numpy as np
+
+
+class PartitionedIndex:
+    """
+    Wrap a minsearch VectorSearch factory with per-value partitions
+
+    fit builds the full index (used for queries that do not filter on the
+    partition field) and one sub-index per distinct field value. A query
+    whose filter_dict names a single value of the field is routed straight
+    to that partition, so its cost grows with the partition and not with
+    the corpus. Cosine scores only depend on the query and the document, so
+    results are the same as filtering the full index.
+
+    Text indexes are not partitioned: minsearch.Index computes idf over the
+    documents it is fitted on, so a per-value Index would score differently.
+
+    Example:
+        index = PartitionedIndex('course', lambda: VectorSearch(keyword_fields={'course'}))
+        index.fit(documents, vectors)
+        index.search(query_vector, filter_dict={'course': 'mlops-zoomcamp'})
+    """
+
+    def __init__(self, field, make_index):
+        self.field = field
+        self.make_index = make_index
+        self.index = None
+        self.partitions = {}
+        self.rows = {}
+
+    def fit(self, documents, vectors):
+        """
+        Fit the full index and the partitions
+
+        Args:
+            documents: Payload documents
+            vectors: 2D array with one row per document
+        """
+        vectors = np.asarray(vectors)
+        self.index = self.make_index().fit(vectors, documents)
+
+        groups = {}
+        for i, doc in enumerate(documents):
+            groups.setdefault(doc.get(self.field), []).append(i)
+
+        self.partitions = {}
+        self.rows = {}
+        for value, rows in groups.items():
+            rows = np.array(rows)
+            part_docs = [documents[i] for i in rows]
+            self.partitions[value] = self.make_index().fit(vectors[rows], part_docs)
+            self.rows[value] = rows
+        return self
+
+    def route(self, filter_dict):
+        """(partition value or None, remaining filters) for a filter_dict"""
+        filter_dict = dict(filter_dict or {})
+        value = filter_dict.get(self.field)
+        if isinstance(value, (list, tuple, set)):
+            if len(value) != 1:
+                return None, filter_dict
+            value = next(iter(value))
+        if value is None:
+            return None, filter_dict
+        del filter_dict[self.field]
+        return value, filter_dict
+
+    def search(self, query, filter_dict=None, num_results=10, output_ids=False, **kwargs):
+        """
+        Search the matching partition, or the full index without a partition filter
+
+        Takes the same arguments as the wrapped index's search; '_id' values
+        (output_ids=True) are positions in the documents passed to fit.
+        """
+        value, filter_dict = self.route(filter_dict)
+        if value is None:
+            return self.index.search(query, filter_dict=filter_dict,
+                                     num_results=num_results, output_ids=output_ids, **kwargs)
+
+        partition = self.partitions.get(value)
+        if partition is None:
+            return []
+        results = partition.search(query, filter_dict=filter_dict,
+                                   num_results=num_results, output_ids=output_ids, **kwargs)
+        if output_ids:
+            rows = self.rows[value]
+            results = [{**doc, '_id': int(rows[doc['_id']])} for doc in results]
+        return results
@@ -4,33 +4,18 @@ Qdrant Vector Search Evaluation
 Evaluates search performance using Qdrant vector database
 """
 
+import hashlib
+import json
+import uuid
+
 import numpy as np
 from tqdm.auto import tqdm
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.decomposition import TruncatedSVD
-from sklearn.pipeline import make_pipeline
 from qdrant_client import QdrantClient
 from qdrant_client.http import models
 
-
-def hit_rate(relevance_total):
-    """Calculate hit rate metric"""
-    cnt = 0
-    for line in relevance_total:
-        if True in line:
-            cnt = cnt + 1
-    return cnt / len(relevance_total)
-
-
-def mrr(relevance_total):
-    """Calculate Mean Reciprocal Rank metric"""
-    total_score = 0.0
-    for line in relevance_total:
-        for rank in range(len(line)):
-            if line[rank] == True:
-                total_score = total_score + 1 / (rank + 1)
-                break
-    return total_score / len(relevance_total)
+from metrics import hit_rate, mrr
+from model_store import corpus_fingerprint, fit_or_load, store_key
+from qdrant_loader import StreamingLoader
 
 
 def evaluate_search(ground_truth, search_function):
@@ -49,13 +34,157 @@ def evaluate_search(ground_truth, search_function):
     }
 
 
-def run_qdrant_evaluation(documents, ground_truth):
+def course_filter(course):
+    """Qdrant filter restricting results to one course"""
+    return models.Filter(
+        must=[
+            models.FieldCondition(
+                key="course",
+                match=models.MatchValue(value=course)
+            )
+        ]
+    )
+
+
+def ensure_payload_index(client, collection_name, field_name='course'):
+    """Create a keyword payload index on field_name unless the collection has one"""
+    info = client.get_collection(collection_name)
+    if field_name in (info.payload_schema or {}):
+        return False
+    client.create_payload_index(
+        collection_name=collection_name,
+        field_name=field_name,
+        field_schema=models.PayloadSchemaType.KEYWORD,
+        wait=True,
+    )
+    return True
+
+
+def batch_search_qdrant(client, collection_name, pipeline, queries, limit=5, batch_size=256):
+    """
+    Search Qdrant for many queries with few round trips
+    
+    All query texts are encoded with one pipeline.transform call. Queries
+    are grouped by course so each group shares one filter, and sent
+    batch_size at a time through query_batch_points.
+    
+    Returns:
+        list: One list of {'id': ...} results per query, in query order
+    """
+    query_embeddings = pipeline.transform([q['question'] for q in queries])
+    
+    by_course = {}
+    for i, q in enumerate(queries):
+        by_course.setdefault(q['course'], []).append(i)
+    
+    results = [None] * len(queries)
+    for course, positions in by_course.items():
+        query_filter = course_filter(course)
+        for start in range(0, len(positions), batch_size):
+            batch = positions[start:start + batch_size]
+            responses = client.query_batch_points(
+                collection_name=collection_name,
+                requests=[
+                    models.QueryRequest(
+                        query=query_embeddings[i].tolist(),
+                        filter=query_filter,
+                        limit=limit,
+                        with_payload=['id'],
+                    )
+                    for i in batch
+                ],
+            )
+            for i, response in zip(batch, responses):
+                results[i] = [{'id': r.payload['id']} for r in response.points]
+    return results
+
+
+def evaluate_search_batch(ground_truth, batch_search_function):
+    """Evaluate a search function that takes the whole ground truth at once"""
+    all_results = batch_search_function(ground_truth)
+    
+    relevance_total = []
+    for q, results in zip(ground_truth, all_results):
+        doc_id = q['document']
+        relevance = [d['id'] == doc_id for d in results]
+        relevance_total.append(relevance)
+    
+    return {
+        'hit_rate': hit_rate(relevance_total),
+        'mrr': mrr(relevance_total),
+    }
+
+
+def content_hash(doc):
+    """Hash of the fields that end up in a point's vector and payload"""
+    content = json.dumps(
+        [doc['id'], doc['course'], doc['question'], doc['section'], doc['text']]
+    )
+    return hashlib.sha1(content.encode('utf-8')).hexdigest()
+
+
+def point_ids(documents):
+    """Stable Qdrant point ids derived from document ids (repeated ids get a suffix)"""
+    seen = {}
+    ids = []
+    for doc in documents:
+        n = seen.get(doc['id'], 0)
+        seen[doc['id']] = n + 1
+        ids.append(str(uuid.uuid5(uuid.NAMESPACE_URL, f"{doc['id']}/{n}")))
+    return ids
+
+
+def existing_hashes(client, collection_name):
+    """Map of point id -> stored (content hash, pipeline key) for every point in the collection"""
+    hashes = {}
+    offset = None
+    while True:
+        records, offset = client.scroll(
+            collection_name=collection_name,
+            with_payload=['content_hash', 'pipeline'],
+            with_vectors=False,
+            limit=1000,
+            offset=offset,
+        )
+        for record in records:
+            payload = record.payload or {}
+            hashes[str(record.id)] = (payload.get('content_hash'), payload.get('pipeline'))
+        if offset is None:
+            return hashes
+
+
+def diff_documents(ids, hashes, stored_hashes):
+    """
+    Compare the current corpus with what is stored in Qdrant
+    
+    Returns:
+        tuple: (positions of new or changed documents, point ids to delete)
+    """
+    changed = [i for i, (point_id, h) in enumerate(zip(ids, hashes))
+               if stored_hashes.get(point_id) != h]
+    current = set(ids)
+    deleted = [point_id for point_id in stored_hashes if point_id not in current]
+    return changed, deleted
+
+
+def run_qdrant_evaluation(documents, ground_truth, refit=False, batch=True):
     """
     Run Qdrant vector search evaluation
     
+    The embedding pipeline and the document vectors come from the model
+    store (model_store.fit_or_load), so an unchanged corpus is not refitted.
+    The collection is updated incrementally: every point stores its content
+    hash and the store key of the pipeline that embedded it, points whose
+    pair matches are skipped, changed and new documents are upserted and
+    documents no longer in the corpus are deleted. Any corpus change refits
+    the pipeline, which re-upserts every point.
+    
     Args:
         documents: List of document dictionaries
         ground_truth: List of ground truth query dictionaries
+        refit: Force refitting the pipeline and re-upserting every document
+        batch: Encode all queries at once and search through Qdrant's batch
+            query API instead of one request per query
     
     Returns:
         dict: Dictionary containing evaluation metrics
@@ -71,6 +200,7 @@ def run_qdrant_evaluation(documents, ground_truth):
         try:
             client.get_collection(collection_name)
             print(f"Using existing collection: {collection_name}")
+            created = False
         except:
             print(f"Creating new collection: {collection_name}")
             client.create_collection(
@@ -80,9 +210,11 @@ def run_qdrant_evaluation(documents, ground_truth):
                     distance=models.Distance.COSINE
                 )
             )
+            created = True
         
-        # Create embeddings using TF-IDF + SVD
-        print("Creating embeddings with TF-IDF + SVD...")
+        # Course filters are answered from the payload index instead of a scan
+        if ensure_payload_index(client, collection_name, 'course'):
+            print("Created payload index on 'course'")
         
         # Prepare text for embedding
         texts = []
@@ -90,36 +222,52 @@ def run_qdrant_evaluation(documents, ground_truth):
             text = f"{doc['question']} {doc['section']} {doc['text']}"
             texts.append(text)
         
-        # Create embedding pipeline
-        pipeline = make_pipeline(
-            TfidfVectorizer(min_df=3, max_features=1000),
-            TruncatedSVD(n_components=128, random_state=1)
-        )
+        # Create embeddings using TF-IDF + SVD (loaded from the store when fitted before)
+        print("Fitting or loading TF-IDF + SVD pipeline...")
+        recipe = 'question+section+text'
+        tfidf_params = {'min_df': 3, 'max_features': 1000}
+        svd_params = {'n_components': 128, 'random_state': 1}
+        pipeline, X = fit_or_load(texts, recipe=recipe, tfidf_params=tfidf_params,
+                                  svd_params=svd_params, refit=refit)
+        pipeline_key = store_key(recipe, tfidf_params, svd_params, corpus_fingerprint(texts))
         
-        # Fit and transform documents
-        embeddings = pipeline.fit_transform(texts)
+        # Work out what changed since the last run
+        ids = point_ids(documents)
+        hashes = [(content_hash(doc), pipeline_key) for doc in documents]
+        stored_hashes = {} if created else existing_hashes(client, collection_name)
+        changed, deleted_ids = diff_documents(ids, hashes, stored_hashes)
+        if refit:
+            changed = list(range(len(documents)))
+        print(f"{len(changed)} new or changed, {len(documents) - len(changed)} unchanged, "
+              f"{len(deleted_ids)} deleted documents")
         
-        # Prepare documents for indexing
-        points = []
-        for i, doc in enumerate(documents):
-            points.append(models.PointStruct(
-                id=i,
-                vector=embeddings[i].tolist(),
-                payload={
-                    'id': doc['id'],
-                    'course': doc['course'],
-                    'question': doc['question'],
-                    'section': doc['section'],
-                    'text': doc['text']
-                }
-            ))
+        if deleted_ids:
+            client.delete(
+                collection_name=collection_name,
+                points_selector=models.PointIdsList(points=deleted_ids),
+            )
         
-        # Upload points to Qdrant
-        print(f"Uploading {len(points)} documents to Qdrant...")
-        client.upsert(
-            collection_name=collection_name,
-            points=points
-        )
+        # Only the changed documents are streamed to Qdrant
+        if changed:
+            embeddings = X[changed]
+            
+            def generate_points():
+                for embedding, i in zip(embeddings, changed):
+                    doc = documents[i]
+                    yield ids[i], embedding, {
+                        'id': doc['id'],
+                        'course': doc['course'],
+                        'question': doc['question'],
+                        'section': doc['section'],
+                        'text': doc['text'],
+                        'content_hash': hashes[i][0],
+                        'pipeline': pipeline_key,
+                    }
+            
+            print(f"Uploading {len(changed)} documents to Qdrant...")
+            loader = StreamingLoader(client, collection_name, batch_size=256, writers=4)
+            load_stats = loader.load(generate_points())
+            print(f"Uploaded {load_stats['uploaded']} points in {load_stats['batches']} batches")
         
         def search_qdrant(query):
             # Encode query using the same pipeline
@@ -128,15 +276,8 @@ def run_qdrant_evaluation(documents, ground_truth):
             # Search in Qdrant
             results = client.query_points(
                 collection_name=collection_name,
-                query_vector=query_embedding.tolist(),
-                query_filter=models.Filter(
-                    must=[
-                        models.FieldCondition(
-                            key="course",
-                            match=models.MatchValue(value=query['course'])
-                        )
-                    ]
-                ),
+                query=query_embedding.tolist(),
+                query_filter=course_filter(query['course']),
                 limit=5
             )
             
@@ -145,7 +286,13 @@ def run_qdrant_evaluation(documents, ground_truth):
         
         # Evaluate Qdrant search
         print("Evaluating Qdrant search performance...")
-        metrics = evaluate_search(ground_truth, search_qdrant)
+        if batch:
+            metrics = evaluate_search_batch(
+                ground_truth,
+                lambda queries: batch_search_qdrant(client, collection_name, pipeline, queries)
+            )
+        else:
+            metrics = evaluate_search(ground_truth, search_qdrant)
         
         return {
             'qdrant_mrr': metrics['mrr'],
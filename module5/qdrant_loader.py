@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Streaming Qdrant Loader
+Upserts a stream of points in batches with parallel writers, retries and resume
+"""
+
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from itertools import islice
+
+from qdrant_client.http import models
+
+
+def batched(iterable, size):
+    """Yield consecutive lists of at most size items"""
+    iterator = iter(iterable)
+    while True:
+        batch = list(islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
+
+def is_local_client(client):
+    """True for a QdrantClient created with ":memory:" or a local path"""
+    options = getattr(client, 'init_options', None) or {}
+    return options.get('location') == ':memory:' or options.get('path') is not None
+
+
+class StreamingLoader:
+    """
+    Upload (id, vector, payload) tuples to a Qdrant collection
+
+    Points are consumed lazily, so memory is bounded by
+    batch_size * max_pending points regardless of corpus size.
+    With a checkpoint_path, the index of the last batch that was committed
+    together with every batch before it is saved after each upsert;
+    a later run with the same input order skips those batches.
+    """
+
+    def __init__(self, client, collection_name, batch_size=256, writers=4,
+                 max_retries=3, retry_delay=0.5, max_pending=None, checkpoint_path=None,
+                 serialize_writes=None):
+        self.client = client
+        self.collection_name = collection_name
+        self.batch_size = batch_size
+        self.writers = writers
+        self.max_retries = max_retries
+        self.retry_delay = retry_delay
+        self.max_pending = max_pending or 2 * writers
+        self.checkpoint_path = checkpoint_path
+        # Local mode (":memory:" or a path) is not thread-safe, so its
+        # upserts are serialized; batching and streaming still apply
+        if serialize_writes is None:
+            serialize_writes = is_local_client(client)
+        self.write_lock = threading.Lock() if serialize_writes else None
+
+    def load_checkpoint(self):
+        """Number of leading batches already committed (0 without a checkpoint)"""
+        if self.checkpoint_path is None or not os.path.exists(self.checkpoint_path):
+            return 0
+        with open(self.checkpoint_path) as f:
+            checkpoint = json.load(f)
+        if (checkpoint.get("collection") != self.collection_name
+                or checkpoint.get("batch_size") != self.batch_size):
+            return 0
+        return checkpoint["committed_batches"]
+
+    def save_checkpoint(self, committed_batches):
+        if self.checkpoint_path is None:
+            return
+        tmp_path = self.checkpoint_path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({
+                "collection": self.collection_name,
+                "batch_size": self.batch_size,
+                "committed_batches": committed_batches,
+            }, f)
+        os.replace(tmp_path, self.checkpoint_path)
+
+    def clear_checkpoint(self):
+        if self.checkpoint_path is not None and os.path.exists(self.checkpoint_path):
+            os.remove(self.checkpoint_path)
+
+    def _upsert(self, points):
+        self.client.upsert(
+            collection_name=self.collection_name,
+            points=points,
+            wait=True,
+        )
+
+    def upsert_batch(self, batch):
+        """Upsert one batch, retrying with exponential backoff"""
+        points = [
+            models.PointStruct(id=point_id, vector=vector.tolist(), payload=payload)
+            for point_id, vector, payload in batch
+        ]
+        for attempt in range(self.max_retries + 1):
+            try:
+                if self.write_lock is None:
+                    self._upsert(points)
+                else:
+                    with self.write_lock:
+                        self._upsert(points)
+                return len(points)
+            except Exception:
+                if attempt == self.max_retries:
+                    raise
+                time.sleep(self.retry_delay * 2 ** attempt)
+
+    def load(self, points):
+        """
+        Upsert all points
+
+        Args:
+            points: Iterable of (id, vector, payload) tuples in a stable order,
+                with each vector a 1D numpy array
+
+        Returns:
+            dict: Points uploaded, batches uploaded and batches skipped by resume
+        """
+        skip = self.load_checkpoint()
+        batches = batched(points, self.batch_size)
+        for _ in islice(batches, skip):
+            pass
+
+        uploaded = 0
+        done = set()
+        committed = skip
+        pending = {}
+        with ThreadPoolExecutor(max_workers=self.writers) as executor:
+            def collect(return_when):
+                nonlocal uploaded, committed
+                finished, _ = wait(pending, return_when=return_when)
+                for future in finished:
+                    batch_number = pending.pop(future)
+                    uploaded += future.result()
+                    done.add(batch_number)
+                while committed in done:
+                    done.remove(committed)
+                    committed += 1
+                self.save_checkpoint(committed)
+
+            for batch_number, batch in enumerate(batches, start=skip):
+                pending[executor.submit(self.upsert_batch, batch)] = batch_number
+                if len(pending) >= self.max_pending:
+                    collect(FIRST_COMPLETED)
+            while pending:
+                collect(FIRST_COMPLETED)
+
+        self.clear_checkpoint()
+        return {
+            "uploaded": uploaded,
+            "batches": committed - skip,
+            "skipped_batches": skip,
+        }
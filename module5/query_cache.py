@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+Semantic Query Cache
+Two-tier result cache in front of any search function: exact matches on
+normalized query text, then cosine matches against cached query embeddings
+"""
+
+import re
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+
+
+def normalize_query(text):
+    """Lowercase words without punctuation, separated by single spaces"""
+    return " ".join(re.findall(r"\w+", text.lower()))
+
+
+class CacheEntry:
+    def __init__(self, results, created, slot):
+        self.results = results
+        self.created = created
+        self.slot = slot
+
+
+class QueryCache:
+    """
+    Cache search results by query text and, optionally, query embedding
+
+    Lookups first try the normalized text (tier 1). With an embed function,
+    a miss then compares the query embedding with the embeddings of cached
+    queries in the same scope and reuses the results of the closest one if
+    their cosine similarity is at least `threshold` (tier 2). Entries expire
+    after `ttl` seconds and the least recently used entry is evicted once
+    `max_entries` are cached.
+
+    Args:
+        search_function: Retriever to cache, called as search_function(query)
+        text: Query -> query text (default: the query itself)
+        scope: Query -> value that must match for a hit, e.g. the course filter
+        embed: Query text -> 1D vector, enables the semantic tier
+        threshold: Minimum cosine similarity for a semantic hit
+        max_entries: LRU capacity (at least 1)
+        ttl: Seconds an entry stays valid (None for no expiry)
+    """
+
+    def __init__(self, search_function, text=None, scope=None, embed=None, threshold=0.95,
+                 max_entries=1024, ttl=None, clock=time.monotonic):
+        if max_entries < 1:
+            raise ValueError(f"max_entries must be at least 1, got {max_entries}")
+        self.search_function = search_function
+        self.text = text or (lambda query: query)
+        self.scope = scope or (lambda query: None)
+        self.embed = embed
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.clock = clock
+
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+        # Semantic tier: one row per slot, keys tell which entry owns a slot
+        self.vectors = None
+        self.slot_keys = [None] * max_entries
+        self.free_slots = list(range(max_entries - 1, -1, -1))
+        self.counts = {'exact_hits': 0, 'semantic_hits': 0, 'misses': 0,
+                       'evictions': 0, 'expirations': 0}
+
+    def search(self, query):
+        key = (self.scope(query), normalize_query(self.text(query)))
+        vector = None
+        with self.lock:
+            results = self._get(key)
+            if results is not None:
+                self.counts['exact_hits'] += 1
+                return results
+
+        if self.embed is not None:
+            vector = self._unit(self.embed(key[1]))
+            with self.lock:
+                results = self._get_similar(key[0], vector)
+                if results is not None:
+                    self.counts['semantic_hits'] += 1
+                    return results
+
+        results = self.search_function(query)
+        with self.lock:
+            self.counts['misses'] += 1
+            self._put(key, results, vector)
+        return results
+
+    __call__ = search
+
+    def _unit(self, vector):
+        vector = np.asarray(vector, dtype=np.float32).ravel()
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm > 0 else vector
+
+    def _expired(self, entry):
+        return self.ttl is not None and self.clock() - entry.created > self.ttl
+
+    def _get(self, key):
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+        if self._expired(entry):
+            self._remove(key)
+            self.counts['expirations'] += 1
+            return None
+        self.entries.move_to_end(key)
+        return entry.results
+
+    def _get_similar(self, scope, vector):
+        if self.vectors is None or not self.entries:
+            return None
+        similarities = self.vectors @ vector
+        candidates = [slot for slot, key in enumerate(self.slot_keys)
+                      if key is not None and key[0] == scope]
+        if not candidates:
+            return None
+        candidates = np.array(candidates)
+        order = candidates[np.argsort(-similarities[candidates])]
+        for slot in order:
+            if similarities[slot] < self.threshold:
+                return None
+            results = self._get(self.slot_keys[slot])
+            if results is not None:
+                return results
+        return None
+
+    def _put(self, key, results, vector):
+        if key in self.entries:
+            self._remove(key)
+        while len(self.entries) >= self.max_entries:
+            oldest = next(iter(self.entries))
+            self._remove(oldest)
+            self.counts['evictions'] += 1
+
+        slot = None
+        if vector is not None:
+            if self.vectors is None:
+                self.vectors = np.zeros((self.max_entries, len(vector)), dtype=np.float32)
+            slot = self.free_slots.pop()
+            self.vectors[slot] = vector
+            self.slot_keys[slot] = key
+        self.entries[key] = CacheEntry(results, self.clock(), slot)
+
+    def _remove(self, key):
+        entry = self.entries.pop(key)
+        if entry.slot is not None:
+            self.slot_keys[entry.slot] = None
+            self.vectors[entry.slot] = 0
+            self.free_slots.append(entry.slot)
+
+    def clear(self):
+        with self.lock:
+            for key in list(self.entries):
+                self._remove(key)
+
+    def stats(self):
+        """Hit/miss counters, hit rate and current size"""
+        with self.lock:
+            stats = dict(self.counts)
+            stats['size'] = len(self.entries)
+        lookups = stats['exact_hits'] + stats['semantic_hits'] + stats['misses']
+        stats['hit_rate'] = (stats['exact_hits'] + stats['semantic_hits']) / lookups if lookups else 0.0
+        return stats
+
+
+def format_cache_stats(stats):
+    """One-line summary of cache effectiveness"""
+    return (f"hit_rate={stats['hit_rate']:.3f} exact={stats['exact_hits']} "
+            f"semantic={stats['semantic_hits']} misses={stats['misses']} "
+            f"evictions={stats['evictions']} expired={stats['expirations']} size={stats['size']}")
@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+"""
+Fast ROUGE Scorer
+ROUGE-1/2/L over integer token arrays, with a tokenization cache, a process
+pool for large inputs and explicit failure reasons
+"""
+
+import os
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+
+import numpy as np
+
+
+METRICS = ('rouge-1', 'rouge-2', 'rouge-l')
+STATS = ('f', 'p', 'r')
+
+
+class RougeError(ValueError):
+    """A pair of texts that cannot be scored"""
+
+
+class Vocabulary:
+    """Maps words to integer ids so n-grams can be compared as numpy arrays"""
+
+    def __init__(self):
+        self.ids = {}
+
+    def encode(self, words):
+        ids = self.ids
+        return np.fromiter((ids.setdefault(w, len(ids)) for w in words),
+                           dtype=np.int64, count=len(words))
+
+
+_vocabulary = Vocabulary()
+
+
+Tokens = namedtuple('Tokens', ['words', 'sentences'])
+
+
+@lru_cache(maxsize=100_000)
+def tokenize(text):
+    """
+    Split text into word ids the same way as the `rouge` package
+
+    Sentences are split on '.', whitespace is collapsed and words are split
+    on single spaces. Results are cached, so repeated texts (such as the
+    original answer shared by several questions) are tokenized once.
+
+    Returns:
+        Tokens: All word ids in order, and the word ids of each sentence
+    """
+    if not isinstance(text, str):
+        raise RougeError(f"expected text, got {type(text).__name__}")
+    sentences = [" ".join(s.split()) for s in text.split(".") if len(s) > 0]
+    if not sentences:
+        raise RougeError("text is empty")
+    sentence_ids = [_vocabulary.encode(s.split(" ")) for s in sentences]
+    return Tokens(np.concatenate(sentence_ids), sentence_ids)
+
+
+def ngram_ids(tokens, n, vocab_size):
+    """Unique n-grams of a token array, each packed into one int64"""
+    if len(tokens) < n:
+        return np.empty(0, dtype=np.int64)
+    grams = tokens[:len(tokens) - n + 1].copy()
+    for offset in range(1, n):
+        grams = grams * vocab_size + tokens[offset:len(tokens) - n + 1 + offset]
+    return np.unique(grams)
+
+
+def lcs_words(ref, hyp):
+    """
+    Word ids on the longest common subsequence of two sentences
+
+    Traced back with the same tie-breaking as the `rouge` package, so the
+    same words are picked. Sentences are short, so plain lists beat numpy.
+    """
+    n, m = len(ref), len(hyp)
+    table = [[0] * (m + 1)]
+    for i in range(n):
+        prev = table[-1]
+        row = [0]
+        left = 0
+        for j in range(m):
+            if hyp[j] == ref[i]:
+                left = prev[j] + 1
+            elif prev[j + 1] > left:
+                left = prev[j + 1]
+            row.append(left)
+        table.append(row)
+
+    words = []
+    i, j = n, m
+    while i > 0 and j > 0:
+        if ref[i - 1] == hyp[j - 1]:
+            words.append(ref[i - 1])
+            i -= 1
+            j -= 1
+        elif table[i - 1][j] > table[i][j - 1]:
+            i -= 1
+        else:
+            j -= 1
+    return words
+
+
+def union_lcs_length(ref_sentences, hyp_sentences):
+    """
+    Summary-level union LCS as computed by the `rouge` package
+
+    The distinct words on the LCS of every (reference sentence, hypothesis
+    sentence) pair are collected in one set; its size is the overlap.
+    """
+    union = set()
+    hyp_sentences = [h.tolist() for h in hyp_sentences]
+    hyp_sets = [set(h) for h in hyp_sentences]
+    for ref in ref_sentences:
+        ref = ref.tolist()
+        ref_set = set(ref)
+        for hyp, hyp_set in zip(hyp_sentences, hyp_sets):
+            # Sentences without a shared word have an empty LCS
+            if not ref_set.isdisjoint(hyp_set):
+                union.update(lcs_words(ref, hyp))
+    return len(union)
+
+
+def f_p_r(overlap, hyp_count, ref_count):
+    precision = overlap / hyp_count if hyp_count else 0.0
+    recall = overlap / ref_count if ref_count else 0.0
+    f1 = 2.0 * ((precision * recall) / (precision + recall + 1e-8))
+    return f1, precision, recall
+
+
+def score_pair(hyp, ref):
+    """
+    ROUGE-1, ROUGE-2 and ROUGE-L of one hypothesis against one reference
+
+    All three match the `rouge` package defaults (exclusive mode): ROUGE-1/2
+    count unique n-grams, ROUGE-L is the summary-level union LCS over the
+    '.'-separated sentences, with precision and recall over unique words.
+
+    Returns:
+        dict: {'rouge-1': {'f', 'p', 'r'}, 'rouge-2': ..., 'rouge-l': ...}
+
+    Raises:
+        RougeError: If either text cannot be scored
+    """
+    hyp_tokens = tokenize(hyp)
+    ref_tokens = tokenize(ref)
+    vocab_size = max(len(_vocabulary.ids), 1)
+
+    scores = {}
+    for n in (1, 2):
+        hyp_grams = ngram_ids(hyp_tokens.words, n, vocab_size)
+        ref_grams = ngram_ids(ref_tokens.words, n, vocab_size)
+        overlap = len(np.intersect1d(hyp_grams, ref_grams, assume_unique=True))
+        scores[f'rouge-{n}'] = dict(zip(STATS, f_p_r(overlap, len(hyp_grams), len(ref_grams))))
+
+    lcs = union_lcs_length(ref_tokens.sentences, hyp_tokens.sentences)
+    hyp_words = len(np.unique(hyp_tokens.words))
+    ref_words = len(np.unique(ref_tokens.words))
+    scores['rouge-l'] = dict(zip(STATS, f_p_r(lcs, hyp_words, ref_words)))
+    return scores
+
+
+def score_chunk(pairs):
+    """
+    Score a list of (hyp, ref) pairs
+
+    Returns:
+        tuple: (float array of shape (pairs, 3 metrics, 3 stats) with NaN
+            for failed rows, list of (row, reason) failures)
+    """
+    scores = np.full((len(pairs), len(METRICS), len(STATS)), np.nan)
+    failures = []
+    for i, (hyp, ref) in enumerate(pairs):
+        try:
+            pair_scores = score_pair(hyp, ref)
+        except RougeError as e:
+            failures.append((i, str(e)))
+            continue
+        for m, metric in enumerate(METRICS):
+            for s, stat in enumerate(STATS):
+                scores[i, m, s] = pair_scores[metric][stat]
+    return scores, failures
+
+
+class RougeResult:
+    """Scores of a batch of pairs plus the rows that could not be scored"""
+
+    def __init__(self, scores, failures):
+        self.scores = scores
+        self.failures = failures
+
+    def values(self, metric='rouge-1', stat='f'):
+        """Per-row values (NaN for failed rows)"""
+        return self.scores[:, METRICS.index(metric), STATS.index(stat)]
+
+    def mean(self, metric='rouge-1', stat='f'):
+        """Average over the rows that were scored"""
+        values = self.values(metric, stat)
+        values = values[~np.isnan(values)]
+        return float(values.mean()) if len(values) else float('nan')
+
+
+def score_all(hyps, refs, workers=None, chunk_size=500):
+    """
+    Score aligned lists of hypotheses and references
+
+    Inputs larger than one chunk are split into contiguous chunks and scored
+    across a process pool (workers=1 keeps everything in-process).
+
+    Returns:
+        RougeResult: Scores and failures as (row index, reason)
+    """
+    pairs = list(zip(hyps, refs))
+    chunks = [pairs[i:i + chunk_size] for i in range(0, len(pairs), chunk_size)]
+    workers = min(workers or os.cpu_count() or 1, len(chunks)) or 1
+
+    if workers == 1:
+        chunk_results = map(score_chunk, chunks)
+        executor = None
+    else:
+        executor = ProcessPoolExecutor(max_workers=workers)
+        chunk_results = executor.map(score_chunk, chunks)
+
+    try:
+        all_scores = []
+        failures = []
+        for c, (scores, chunk_failures) in enumerate(chunk_results):
+            all_scores.append(scores)
+            failures.extend((c * chunk_size + i, reason) for i, reason in chunk_failures)
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+    if not all_scores:
+        return RougeResult(np.empty((0, len(METRICS), len(STATS))), [])
+    return RougeResult(np.concatenate(all_scores), failures)
@@ -7,64 +7,20 @@ Evaluates different search methods using various metrics
 import requests
 import pandas as pd
 import numpy as np
-from tqdm.auto import tqdm
 import minsearch
 from minsearch import VectorSearch
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.decomposition import TruncatedSVD
-from sklearn.pipeline import make_pipeline
-from rouge import Rouge
 from qdrant_client import QdrantClient
 from qdrant_client.http import models
 
-
-def hit_rate(relevance_total):
-    """Calculate hit rate metric"""
-    cnt = 0
-    for line in relevance_total:
-        if True in line:
-            cnt = cnt + 1
-    return cnt / len(relevance_total)
-
-
-def mrr(relevance_total):
-    """Calculate Mean Reciprocal Rank metric"""
-    total_score = 0.0
-    for line in relevance_total:
-        for rank in range(len(line)):
-            if line[rank] == True:
-                total_score = total_score + 1 / (rank + 1)
-                break
-    return total_score / len(relevance_total)
-
-
-def evaluate(ground_truth, search_function):
-    """Evaluate search function using ground truth data"""
-    relevance_total = []
-    
-    for q in tqdm(ground_truth, desc="Evaluating search"):
-        doc_id = q['document']
-        results = search_function(q)
-        relevance = [d['id'] == doc_id for d in results]
-        relevance_total.append(relevance)
-    
-    return {
-        'hit_rate': hit_rate(relevance_total),
-        'mrr': mrr(relevance_total),
-    }
-
-
-def cosine(u, v):
-    """Calculate cosine similarity between two vectors"""
-    u_norm = np.sqrt(u.dot(u))
-    v_norm = np.sqrt(v.dot(v))
-    return u.dot(v) / (u_norm * v_norm)
-
-
-def normalize(u):
-    """Normalize a vector"""
-    norm = np.sqrt(u.dot(u))
-    return u / norm
+from ann_index import IVFIndex
+from answer_similarity import batch_cosine
+from eval_runner import EvaluationRunner, format_metrics
+from hybrid_search import HybridRetriever
+from model_store import fit_or_load
+from multifield import FieldCounts
+from partitioned_index import PartitionedIndex
+from query_cache import QueryCache, format_cache_stats
+from rouge_scorer import score_all
 
 
 def main():
@@ -82,9 +38,12 @@ def main():
     ground_truth = df_ground_truth.to_dict(orient='records')
     print(f"Loaded {len(ground_truth)} ground truth queries")
     
+    # In-process searches are CPU-bound, so they run on a (forked) process pool
+    runner = EvaluationRunner(executor='process')
     
     # Minsearch text evaluation
     print("\n=== Minsearch Text Search ===")
+    # Not partitioned: per-course indexes would compute idf per course
     index = minsearch.Index(
         text_fields=["question", "section", "text"],
         keyword_fields=["course", "id"]
@@ -101,7 +60,8 @@ def main():
         )
         return results
     
-    metrics_minsearch = evaluate(ground_truth, search_minsearch)
+    metrics_minsearch = runner.evaluate(ground_truth, search_minsearch)
+    print(format_metrics(metrics_minsearch))
     hit_rate_minsearch = metrics_minsearch['hit_rate']
     print(f"Hit Rate: {hit_rate_minsearch:.3f}")
     
@@ -112,14 +72,16 @@ def main():
         t = doc['question']
         texts_question.append(t)
     
-    pipeline_question = make_pipeline(
-        TfidfVectorizer(min_df=3),
-        TruncatedSVD(n_components=128, random_state=1)
+    # Each field is tokenized once and shared by the question and Q+A indexes
+    field_counts = FieldCounts(documents, ['question', 'text'])
+    
+    pipeline_question, X_question = fit_or_load(
+        texts_question, recipe='question',
+        fit=lambda: field_counts.fit_pipeline({'question': 1})
     )
-    X_question = pipeline_question.fit_transform(texts_question)
     
-    vindex_question = VectorSearch(keyword_fields={'course'})
-    vindex_question.fit(X_question, documents)
+    vindex_question = PartitionedIndex('course', lambda: VectorSearch(keyword_fields={'course'}))
+    vindex_question.fit(documents, X_question)
     
     def search_vector_question(query):
         v_query = pipeline_question.transform([query['question']])
@@ -130,7 +92,8 @@ def main():
         )
         return results
     
-    metrics_question = evaluate(ground_truth, search_vector_question)
+    metrics_question = runner.evaluate(ground_truth, search_vector_question)
+    print(format_metrics(metrics_question))
     mrr_question = metrics_question['mrr']
     print(f"MRR: {mrr_question:.3f}")
     
@@ -141,14 +104,13 @@ def main():
         t = doc['question'] + ' ' + doc['text']
         texts_qa.append(t)
     
-    pipeline_qa = make_pipeline(
-        TfidfVectorizer(min_df=3),
-        TruncatedSVD(n_components=128, random_state=1)
+    pipeline_qa, X_qa = fit_or_load(
+        texts_qa, recipe='question+text',
+        fit=lambda: field_counts.fit_pipeline({'question': 1, 'text': 1})
     )
-    X_qa = pipeline_qa.fit_transform(texts_qa)
     
-    vindex_qa = VectorSearch(keyword_fields={'course'})
-    vindex_qa.fit(X_qa, documents)
+    vindex_qa = PartitionedIndex('course', lambda: VectorSearch(keyword_fields={'course'}))
+    vindex_qa.fit(documents, X_qa)
     
     def search_vector_qa(query):
         v_query = pipeline_qa.transform([query['question']])
@@ -159,10 +121,74 @@ def main():
         )
         return results
     
-    metrics_qa = evaluate(ground_truth, search_vector_qa)
+    metrics_qa = runner.evaluate(ground_truth, search_vector_qa, keep_results=True)
+    print(format_metrics(metrics_qa))
     hit_rate_qa = metrics_qa['hit_rate']
     print(f"Hit Rate: {hit_rate_qa:.3f}")
     
+    # Same vectors through the IVF index, compared with exact search above
+    print("\n=== ANN Vector Search (Question + Answer, IVF) ===")
+    ann_qa = IVFIndex(keyword_fields=['course'], min_partition_size=128)
+    ann_qa.fit(X_qa, documents)
+    
+    for n_probe in [1, 2, 4, 8]:
+        def search_ann_qa(query, n_probe=n_probe):
+            v_query = pipeline_qa.transform([query['question']])
+            return ann_qa.search(
+                v_query[0],
+                filter_dict={'course': query['course']},
+                num_results=5,
+                n_probe=n_probe
+            )
+        
+        metrics_ann = runner.evaluate(ground_truth, search_ann_qa,
+                                      exact_results=metrics_qa['results'])
+        print(f"n_probe={n_probe}: {format_metrics(metrics_ann)}")
+    
+    # Hybrid search: minsearch text + Q+A vectors, reusing the fitted indexes
+    print("\n=== Hybrid Search (Text + Vector, RRF) ===")
+    
+    def text_candidates(query, num_results):
+        return index.search(
+            query=query['question'],
+            filter_dict={'course': query['course']},
+            boost_dict={'question': 1.5, 'section': 0.1},
+            num_results=num_results
+        )
+    
+    def vector_candidates(query, num_results):
+        v_query = pipeline_qa.transform([query['question']])
+        return vindex_qa.search(
+            v_query[0],
+            filter_dict={'course': query['course']},
+            num_results=num_results
+        )
+    
+    hybrid = HybridRetriever([text_candidates, vector_candidates], fusion='rrf')
+    
+    def search_hybrid(query):
+        return hybrid.search(query, num_results=5)
+    
+    metrics_hybrid = runner.evaluate(ground_truth, search_hybrid)
+    print(format_metrics(metrics_hybrid))
+    
+    # Repeated and near-duplicate questions are answered from the query cache;
+    # threads share one cache, so its counters cover the whole run
+    print("\n=== Hybrid Search with Query Cache ===")
+    cache = QueryCache(
+        search_hybrid,
+        text=lambda query: query['question'],
+        scope=lambda query: query['course'],
+        embed=lambda text: pipeline_qa.transform([text])[0],
+        threshold=0.95,
+        max_entries=4096,
+        ttl=3600,
+    )
+    metrics_cached = EvaluationRunner(executor='thread').evaluate(ground_truth, cache.search)
+    print(format_metrics(metrics_cached))
+    print(format_cache_stats(cache.stats()))
+    hybrid.close()
+    
     # Qdrant evaluation
     print("\n=== Qdrant Vector Search ===")
     try:
@@ -180,44 +206,31 @@ def main():
     df_results = pd.read_csv(results_url)
     print(f"Loaded {len(df_results)} result pairs")
     
-    # Create pipeline for embeddings
-    pipeline_cosine = make_pipeline(
-        TfidfVectorizer(min_df=3),
-        TruncatedSVD(n_components=128, random_state=1)
-    )
-    
-    # Fit on all text data
+    # Fit (or load) the embedding pipeline on all text data
     all_texts = (df_results.answer_llm + ' ' + 
                 df_results.answer_orig + ' ' + 
                 df_results.question)
-    pipeline_cosine.fit(all_texts)
+    pipeline_cosine, _ = fit_or_load(all_texts, recipe='answer_llm+answer_orig+question')
     
-    # Calculate cosine similarities
-    cosine_similarities = []
-    for idx, row in df_results.iterrows():
-        v_llm = pipeline_cosine.transform([row.answer_llm])[0]
-        v_orig = pipeline_cosine.transform([row.answer_orig])[0]
-        cos_sim = cosine(v_llm, v_orig)
-        cosine_similarities.append(cos_sim)
+    # Calculate cosine similarities, one transform per answer column
+    cosine_similarities = batch_cosine(
+        pipeline_cosine, df_results.answer_llm, df_results.answer_orig
+    )
     
     avg_cosine = np.mean(cosine_similarities)
     print(f"Average Cosine Similarity: {avg_cosine:.3f}")
     
     # ROUGE evaluation
     print("\n=== ROUGE Evaluation ===")
-    rouge_scorer = Rouge()
-    
-    # Calculate for entire dataframe
-    rouge_f1_scores = []
-    for idx, row in tqdm(df_results.iterrows(), total=len(df_results), desc="Calculating ROUGE"):
-        try:
-            scores = rouge_scorer.get_scores(row.answer_llm, row.answer_orig)[0]
-            rouge_f1_scores.append(scores['rouge-1']['f'])
-        except:
-            # Handle edge cases where ROUGE fails
-            rouge_f1_scores.append(0.0)
-    
-    avg_rouge_f1 = np.mean(rouge_f1_scores)
+    rouge_result = score_all(df_results.answer_llm, df_results.answer_orig)
+    rouge_f1_scores = rouge_result.values('rouge-1', 'f')
+    
+    if rouge_result.failures:
+        print(f"ROUGE failed for {len(rouge_result.failures)} rows:")
+        for row, reason in rouge_result.failures[:10]:
+            print(f"  row {row}: {reason}")
+    
+    avg_rouge_f1 = np.nanmean(rouge_f1_scores)
     print(f"Average ROUGE-1 F1: {avg_rouge_f1:.3f}")
     
    
@@ -0,0 +1,31 @@
+import numpy as np
+
+from metrics import compute_metrics, hit_rate, metrics_with_ci, mrr, per_query_metrics
+
+
+relevance_total = [
+    [False, True, False],
+    [True, False, False],
+    [False, False, False],
+    [False, False],
+]
+
+# Vectorized metrics match the per-query definitions
+assert hit_rate(relevance_total) == 0.5
+assert np.isclose(mrr(relevance_total), (1 / 2 + 1) / 4)
+metrics = compute_metrics(relevance_total)
+assert metrics['hit_rate'] == {1: 0.25, 2: 0.5, 3: 0.5}
+assert np.isclose(metrics['mrr'][3], mrr(relevance_total))
+assert np.isclose(metrics['ndcg'][2], (1 / np.log2(3) + 1) / 4)
+assert np.isclose(metrics['precision'][2], 2 / 8)
+
+# Every query returned no results (K = 0)
+for empty in ([[], []], np.zeros((2, 0), dtype=bool)):
+    per_query = per_query_metrics(empty)
+    assert per_query['hit_rate'].shape == (2, 1)
+    assert all(not values.any() for values in per_query.values())
+    assert compute_metrics(empty)['hit_rate'] == {1: 0.0}
+    assert compute_metrics(empty)['mrr'] == {1: 0.0}
+    assert metrics_with_ci(empty, n_boot=10)['mrr'] == {1: (0.0, 0.0, 0.0)}
+    assert hit_rate(empty) == 0.0 and mrr(empty) == 0.0
+print("OK")
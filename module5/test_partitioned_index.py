@@ -0,0 +1,42 @@
+import numpy as np
+from minsearch import VectorSearch
+
+from partitioned_index import PartitionedIndex
+
+
+rng = np.random.default_rng(1)
+courses = ['data-engineering-zoomcamp', 'machine-learning-zoomcamp', 'mlops-zoomcamp']
+documents = [{'id': f'doc-{i}', 'course': courses[i % 3 if i % 7 else 0]} for i in range(600)]
+vectors = rng.standard_normal((len(documents), 32))
+
+
+def scores(query, results):
+    """Cosine similarity of the query and each returned document"""
+    X = vectors[[r['_id'] for r in results]]
+    return X @ query / (np.linalg.norm(X, axis=1) * np.linalg.norm(query))
+
+
+full = VectorSearch(keyword_fields={'course'}).fit(vectors, documents)
+index = PartitionedIndex('course', lambda: VectorSearch(keyword_fields={'course'}))
+index.fit(documents, vectors)
+
+for q in range(50):
+    query = rng.standard_normal(32)
+    for course in courses + [[courses[1]]]:
+        filter_dict = {'course': course}
+        expected = full.search(query, filter_dict=filter_dict, num_results=5, output_ids=True)
+        results = index.search(query, filter_dict=filter_dict, num_results=5, output_ids=True)
+        assert [r['_id'] for r in results] == [r['_id'] for r in expected]
+        assert np.allclose(scores(query, results), scores(query, expected))
+        name = course if isinstance(course, str) else course[0]
+        assert all(r['course'] == name for r in results)
+
+# Unfiltered, multi-value and unknown filters
+query = rng.standard_normal(32)
+both = {'course': courses[:2]}
+assert index.search(query, output_ids=True) == full.search(query, output_ids=True)
+assert index.search(query, filter_dict=both, output_ids=True) == \
+    full.search(query, filter_dict=both, output_ids=True)
+assert index.search(query, filter_dict={'course': 'llm-zoomcamp'}) == []
+print("Partitions:", {value: len(rows) for value, rows in index.rows.items()})
+print("OK")